@@ -0,0 +1,48 @@
+"""
+Reading and writing the pipeline's intermediate article files.
+Files are written as NDJSON (one article per line); readers also accept the
+older pretty-printed JSON array format.
+"""
+
+from typing import Dict, Iterable, Iterator
+
+import orjson
+
+
+def load_articles(path: str) -> Iterator[Dict]:
+    """
+    Iterate over the articles stored in a file.
+    
+    Args:
+        path: NDJSON file, or a JSON array written by an older version
+    
+    Yields:
+        Article dictionaries in file order
+    """
+    with open(path, 'rb') as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        
+        if first == b'[':
+            yield from orjson.loads(f.read())
+            return
+        
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def dump_articles(path: str, articles: Iterable[Dict]):
+    """
+    Write articles to a file, one JSON object per line.
+    
+    Args:
+        path: Output file path
+        articles: Article dictionaries
+    """
+    with open(path, 'wb') as f:
+        for article in articles:
+            f.write(orjson.dumps(article))
+            f.write(b'\n')
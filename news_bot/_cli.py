@@ -0,0 +1,23 @@
+"""
+Shared helpers for the pipeline stages' command line entry points.
+"""
+
+import sys
+from datetime import datetime
+
+
+def parse_date_or_exit(date: str) -> datetime:
+    """
+    Parse a YYYY-MM-DD date argument, exiting with an error if it is malformed.
+
+    Args:
+        date: Date string from the command line
+
+    Returns:
+        The parsed date (at midnight)
+    """
+    try:
+        return datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        print("Error: Date must be in YYYY-MM-DD format")
+        sys.exit(1)
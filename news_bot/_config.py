@@ -0,0 +1,52 @@
+"""
+Shared config.json loading with a process-wide parse cache.
+Entries are keyed on (absolute path, mtime) so edits to the file are picked up.
+"""
+
+import json
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_CONFIG_CACHE: Dict[Tuple[str, int], Mapping] = {}
+
+
+def load_config(config_file: str) -> Mapping:
+    """
+    Load configuration from a JSON file, reusing the parse while it is unchanged.
+
+    Args:
+        config_file: Path to configuration file
+
+    Returns:
+        Read-only view of the parsed configuration (shared between callers)
+
+    Raises:
+        FileNotFoundError: If the config file does not exist
+    """
+    path = os.path.abspath(config_file)
+    key = (path, os.stat(path).st_mtime_ns)
+
+    config = _CONFIG_CACHE.get(key)
+    if config is None:
+        # bytes in, no text decoding pass; json.loads accepts bytes too
+        data = Path(path).read_bytes()
+        config = MappingProxyType(orjson.loads(data) if orjson else json.loads(data))
+        # Drop parses of older versions of the same file
+        for stale in [k for k in _CONFIG_CACHE if k[0] == path]:
+            del _CONFIG_CACHE[stale]
+        _CONFIG_CACHE[key] = config
+
+    return config
+
+
+def clear_config_cache():
+    """Forget every cached config parse."""
+    _CONFIG_CACHE.clear()
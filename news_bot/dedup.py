@@ -3,121 +3,351 @@ Title-based vector deduplication using SentenceTransformer.
 Computes cosine similarity between article titles and removes duplicates.
 """
 
-import json
 import sys
 import os
-from typing import List, Dict
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Optional, Union
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import torch
+
+try:
+    import faiss
+except ImportError:  # Fall back to the dense similarity matrix
+    faiss = None
+
+from ._articles import dump_articles, load_articles
+from ._cli import parse_date_or_exit
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+# Dynamically quantized INT8 export published alongside the model on the Hub
+ONNX_INT8_FILE = 'onnx/model_qint8_avx512_vnni.onnx'
+EMBEDDING_CACHE_FILE = '_embedding_cache.sqlite'
+# Cached embeddings older than this are deleted; headlines rarely recur later
+EMBEDDING_CACHE_TTL_SECONDS = 7 * 86400
+# Stay below SQLite's default limit on host parameters per statement
+SQLITE_BATCH_SIZE = 500
+# Rows of the similarity matrix computed at a time on the dense fallback path
+DENSE_BLOCK_SIZE = 256
+# Token budget per title; headlines fit well within it, and it is a quarter
+# of the model's default 256-token window
+TITLE_MAX_SEQ_LENGTH = 64
+
+# Models loaded in this process, keyed by use_onnx, so repeated jobs and
+# deduplicator instances share one copy instead of reloading from disk
+_MODEL_CACHE: Dict[bool, SentenceTransformer] = {}
+_MODEL_LOCK = threading.Lock()
 
 
 class NewsDeduplicator:
-    def __init__(self, similarity_threshold: float = 0.85):
+    def __init__(self, similarity_threshold: float = 0.85, use_onnx: bool = True,
+                 cache_file: Optional[str] = EMBEDDING_CACHE_FILE):
         """
         Initialize the deduplicator with SentenceTransformer model.
         
         Args:
             similarity_threshold: Cosine similarity threshold for considering articles as duplicates
+            use_onnx: Run the INT8-quantized ONNX export instead of the FP32 PyTorch model
+            cache_file: SQLite file caching title embeddings across runs (None disables caching)
         """
         self.similarity_threshold = similarity_threshold
-        print("Loading SentenceTransformer model 'all-MiniLM-L6-v2'...")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("Model loaded successfully!")
+        self.cache_file = cache_file
+        self.model = self.get_model(use_onnx)
+        # Part of every cache key: INT8 ONNX and FP32 PyTorch vectors differ
+        # slightly and must not be compared with each other
+        if getattr(self.model, 'backend', 'torch') == 'onnx':
+            self.backend = f"onnx:{ONNX_INT8_FILE}"
+        else:
+            self.backend = 'torch'
+    
+    @classmethod
+    def get_model(cls, use_onnx: bool = True) -> SentenceTransformer:
+        """
+        Return the process-wide embedding model, loading it on first use.
+        
+        Args:
+            use_onnx: Whether to try the quantized ONNX backend first
+            
+        Returns:
+            Loaded SentenceTransformer model
+        """
+        with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(use_onnx)
+            if model is None:
+                print(f"Loading SentenceTransformer model '{MODEL_NAME}'...")
+                model = cls.load_model(use_onnx)
+                _MODEL_CACHE[use_onnx] = model
+                print("Model loaded successfully!")
+            return model
+    
+    @staticmethod
+    def load_model(use_onnx: bool) -> SentenceTransformer:
+        """
+        Load the embedding model, preferring the INT8 ONNX Runtime backend.
+        
+        Args:
+            use_onnx: Whether to try the quantized ONNX backend first
+            
+        Returns:
+            Loaded SentenceTransformer model
+        """
+        model = None
+        if use_onnx:
+            try:
+                model = SentenceTransformer(
+                    MODEL_NAME,
+                    backend='onnx',
+                    model_kwargs={'file_name': ONNX_INT8_FILE}
+                )
+            except Exception as e:
+                print(f"Warning: ONNX backend unavailable ({e}), falling back to PyTorch")
+        
+        if model is None:
+            model = SentenceTransformer(MODEL_NAME)
+        
+        # Truncate to title length so the tokenizer pads batches to at most
+        # TITLE_MAX_SEQ_LENGTH tokens
+        model.max_seq_length = TITLE_MAX_SEQ_LENGTH
+        return model
+    
+    def encode_titles(self, titles: List[str]) -> np.ndarray:
+        """
+        Encode titles into L2-normalized embeddings with the model.
+        
+        Args:
+            titles: List of title strings
+            
+        Returns:
+            numpy array of unit-length title embeddings
+        """
+        # encode() sorts inputs by length before batching, so larger batches
+        # of short titles carry little padding overhead. inference_mode also
+        # skips the autograd view/version tracking that no_grad keeps.
+        with torch.inference_mode():
+            return self.model.encode(
+                titles,
+                batch_size=64,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+    
+    def _open_cache(self) -> sqlite3.Connection:
+        """Open the embedding cache database, creating the table and dropping expired rows."""
+        conn = sqlite3.connect(self.cache_file)
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS title_embeddings "
+                "(hash BLOB PRIMARY KEY, vec BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM title_embeddings WHERE expires <= ?", (time.time(),))
+        return conn
+    
+    def _load_cached_embeddings(self, conn: sqlite3.Connection,
+                                hashes: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Look up cached embeddings for the given title hashes."""
+        cached = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+        for start in range(0, len(unique_hashes), SQLITE_BATCH_SIZE):
+            batch = unique_hashes[start:start + SQLITE_BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT hash, vec FROM title_embeddings WHERE hash IN ({placeholders})", batch
+            )
+            for key, vec in rows:
+                cached[key] = np.frombuffer(vec, dtype=np.float16).astype(np.float32)
+        return cached
     
     def compute_title_embeddings(self, articles: List[Dict]) -> np.ndarray:
         """
-        Compute embeddings for all article titles.
+        Compute L2-normalized embeddings for all article titles.
+        
+        Titles already embedded on a previous run are read from the SQLite
+        cache (keyed by the SHA-256 of model name, backend and title) and only
+        the misses are sent through the model.
         
         Args:
             articles: List of article dictionaries
             
         Returns:
-            numpy array of title embeddings
+            numpy array of unit-length title embeddings
         """
         titles = [article.get('title', '') for article in articles]
-        embeddings = self.model.encode(titles)
-        return embeddings
+        if not self.cache_file:
+            return self.encode_titles(titles)
+        
+        hashes = [
+            hashlib.sha256(f"{MODEL_NAME}\0{self.backend}\0{title}".encode('utf-8')).digest()
+            for title in titles
+        ]
+        
+        conn = self._open_cache()
+        try:
+            with conn:
+                cached = self._load_cached_embeddings(conn, hashes)
+                
+                # Identical titles share a hash, so each miss is encoded only once
+                misses = {key: title for key, title in zip(hashes, titles) if key not in cached}
+                print(f"Embedding cache: {len(cached)} titles cached, "
+                      f"{len(misses)} to encode")
+                
+                if misses:
+                    new_embeddings = self.encode_titles(list(misses.values()))
+                    rows = []
+                    expires = time.time() + EMBEDDING_CACHE_TTL_SECONDS
+                    for key, vec in zip(misses, new_embeddings):
+                        cached[key] = vec
+                        rows.append((key, vec.astype(np.float16).tobytes(), expires))
+                    conn.executemany("INSERT OR REPLACE INTO title_embeddings VALUES (?, ?, ?)", rows)
+        finally:
+            conn.close()
+        
+        return np.stack([cached[key] for key in hashes])
+    
+    def _find_duplicates_dense(self, embeddings: np.ndarray) -> np.ndarray:
+        """Flag duplicates from the cosine similarity matrix, one row block at a time."""
+        n_articles = len(embeddings)
+        is_duplicate = np.zeros(n_articles, dtype=bool)
+        
+        # Embeddings are unit-length, so the dot product is the cosine similarity.
+        # Blocks of DENSE_BLOCK_SIZE rows keep memory at O(block × N) instead of
+        # O(N²), and each block only needs the columns from its first row onward.
+        for start in range(0, n_articles, DENSE_BLOCK_SIZE):
+            stop = min(start + DENSE_BLOCK_SIZE, n_articles)
+            similarity_block = embeddings[start:stop] @ embeddings[start:].T
+            
+            # Only the upper triangle (j > i) is considered, so the first
+            # occurrence is always kept and the later duplicate (j) is removed
+            duplicate_mask = np.triu(similarity_block, k=1) >= self.similarity_threshold
+            is_duplicate[start:] |= duplicate_mask.any(axis=0)
+        
+        return np.flatnonzero(is_duplicate)
+    
+    def _find_duplicates_faiss(self, embeddings: np.ndarray) -> np.ndarray:
+        """Flag duplicates with a FAISS inner-product range search."""
+        index = faiss.IndexFlatIP(embeddings.shape[1])
+        index.add(embeddings)
+        
+        # range_search keeps scores strictly above the radius, so step just
+        # below the threshold to match the inclusive comparison
+        radius = float(np.nextafter(np.float32(self.similarity_threshold), np.float32(-1)))
+        lims, _, neighbors = index.range_search(embeddings, radius)
+        
+        # A neighbor j of query i is a duplicate only when it comes later (j > i)
+        queries = np.repeat(np.arange(len(embeddings)), np.diff(lims).astype(np.int64))
+        return np.unique(neighbors[neighbors > queries])
     
     def find_duplicates(self, embeddings: np.ndarray) -> List[int]:
         """
         Find duplicate articles based on cosine similarity of title embeddings.
         
+        Uses a FAISS range search when faiss is installed, which only returns
+        pairs above the threshold instead of materializing the N×N matrix.
+        
         Args:
-            embeddings: Array of title embeddings
+            embeddings: Array of L2-normalized title embeddings
             
         Returns:
             List of indices to remove (duplicate articles)
         """
-        similarity_matrix = cosine_similarity(embeddings)
-        duplicates_to_remove = set()
+        # Keep the similarity search in contiguous float32: faiss requires it
+        # and it avoids a float64 upcast in the dense path (no copy if already so)
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
         
-        n_articles = len(embeddings)
-        for i in range(n_articles):
-            if i in duplicates_to_remove:
-                continue
-                
-            for j in range(i + 1, n_articles):
-                if j in duplicates_to_remove:
-                    continue
-                    
-                similarity = similarity_matrix[i][j]
-                if similarity >= self.similarity_threshold:
-                    # Keep the first occurrence (i), remove the duplicate (j)
-                    duplicates_to_remove.add(j)
-                    print(f"Duplicate found (similarity: {similarity:.3f}): "
-                          f"Removing article {j}, keeping article {i}")
-        
-        return list(duplicates_to_remove)
+        if faiss is not None:
+            duplicates_to_remove = self._find_duplicates_faiss(embeddings)
+        else:
+            duplicates_to_remove = self._find_duplicates_dense(embeddings)
+        
+        if duplicates_to_remove.size:
+            print(f"Duplicates found: {duplicates_to_remove.size} articles "
+                  f"with similarity >= {self.similarity_threshold}")
+        
+        return duplicates_to_remove.tolist()
+    
+    def remove_exact_duplicates(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Remove articles whose normalized title was already seen.
+        
+        Args:
+            articles: List of article dictionaries
+            
+        Returns:
+            Articles with the first occurrence of each title kept
+        """
+        seen = set()
+        unique_articles = []
+        for article in articles:
+            key = article.get('title', '').strip().lower()
+            if key not in seen:
+                seen.add(key)
+                unique_articles.append(article)
+        return unique_articles
     
-    def deduplicate_articles(self, input_file: str, output_file: str) -> List[Dict]:
+    def deduplicate_articles(self, input_file: Union[str, List[Dict]],
+                             output_file: Optional[str] = None) -> List[Dict]:
         """
         Deduplicate articles from input file and save to output file.
         
         Args:
-            input_file: Path to input JSON file with raw articles
-            output_file: Path to output JSON file for deduplicated articles
+            input_file: Path to input article file (NDJSON or JSON array), or
+                the articles themselves when called in-process
+            output_file: Path to output NDJSON file for deduplicated articles
+                (None skips writing)
             
         Returns:
             List of deduplicated articles
         """
-        # Load articles from input file
-        if not os.path.exists(input_file):
-            raise FileNotFoundError(f"Input file not found: {input_file}")
-        
-        with open(input_file, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
+        if isinstance(input_file, str):
+            # Load articles from input file
+            if not os.path.exists(input_file):
+                raise FileNotFoundError(f"Input file not found: {input_file}")
+            
+            # Sliced and indexed below, so the articles are materialized once
+            articles = list(load_articles(input_file))
+        else:
+            articles = input_file
         
         if not articles:
-            print("No articles found in input file.")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+            print("No articles found in input.")
+            if output_file:
+                dump_articles(output_file, [])
             return []
         
         print(f"Processing {len(articles)} articles for deduplication...")
         
+        # Drop exact title repeats (wire stories, syndicated posts) by hashing
+        # before any of them reach the embedding model
+        unique_title_articles = self.remove_exact_duplicates(articles)
+        exact_count = len(articles) - len(unique_title_articles)
+        print(f"Exact title duplicates removed: {exact_count}")
+        
         # Compute title embeddings
-        embeddings = self.compute_title_embeddings(articles)
+        embeddings = self.compute_title_embeddings(unique_title_articles)
         
         # Find duplicates
-        duplicates_to_remove = self.find_duplicates(embeddings)
+        duplicates_to_remove = set(self.find_duplicates(embeddings))
         
         # Remove duplicates (keep first occurrence)
         deduplicated_articles = []
-        for i, article in enumerate(articles):
+        for i, article in enumerate(unique_title_articles):
             if i not in duplicates_to_remove:
                 deduplicated_articles.append(article)
         
         # Save deduplicated articles
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(deduplicated_articles, f, ensure_ascii=False, indent=2)
+        if output_file:
+            dump_articles(output_file, deduplicated_articles)
         
         removed_count = len(articles) - len(deduplicated_articles)
         print(f"Deduplication completed:")
         print(f"  Original articles: {len(articles)}")
         print(f"  Duplicates removed: {removed_count}")
         print(f"  Final articles: {len(deduplicated_articles)}")
-        print(f"  Results saved to: {output_file}")
+        if output_file:
+            print(f"  Results saved to: {output_file}")
         
         return deduplicated_articles
 
@@ -131,12 +361,7 @@ def main():
     date = sys.argv[1]
     
     # Validate date format
-    try:
-        import datetime
-        datetime.datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        print("Error: Date must be in YYYY-MM-DD format")
-        sys.exit(1)
+    parse_date_or_exit(date)
     
     input_file = f"raw_{date}.json"
     output_file = f"dedup_{date}.json"
@@ -4,18 +4,35 @@ Supports NewsAPI, Guardian API, and RSS feeds.
 """
 
 import requests
-import json
-import time
 import sys
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import re
+import string
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone, date as date_type
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Iterable, List, Dict, Optional, Tuple
 import feedparser
+import orjson
+from lxml import etree
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ._cli import parse_date_or_exit
 
 # Load environment variables
 load_dotenv()
 
+# Maximum number of entries read from each RSS/Atom feed
+MAX_FEED_ENTRIES = 20
+
+# ASCII-only lowercasing table for bytes.translate; the keywords are ASCII,
+# so folding the rest of the UTF-8 text is unnecessary
+_LOWER_TABLE = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+
 
 class NewsFetcher:
     def __init__(self):
@@ -23,9 +40,27 @@ class NewsFetcher:
         self.guardian_key = os.getenv('GUARDIAN_API_KEY')
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'astro-news-bot/1.0'
+            'User-Agent': 'astro-news-bot/1.0',
+            'Accept-Encoding': 'gzip, deflate'
         })
         
+        # Pool enough keep-alive connections for the concurrent RSS workers
+        # and let urllib3 retry connection errors and transient HTTP statuses,
+        # with jittered exponential backoff and honouring Retry-After
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                backoff_jitter=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         # Tech-related keywords for content filtering
         self.tech_keywords = {
             'high_priority': [
@@ -51,46 +86,60 @@ class NewsFetcher:
                 'porn', 'adult', 'sex', 'dating', 'relationship', 'love', 'marriage'
             ]
         }
+        
+        # Compile each keyword group into a single alternation so every article
+        # is scanned once per group instead of once per keyword
+        self._exclude_pattern = self._compile_keywords(self.tech_keywords['exclude_keywords'])
+        self._tech_pattern = self._compile_keywords(
+            self.tech_keywords['high_priority'] + self.tech_keywords['science_keywords']
+        )
     
-    def _is_tech_related(self, article: Dict) -> bool:
-        """Check if an article is tech/AI/science related."""
-        title = article.get('title', '').lower()
-        description = article.get('description', '').lower()
-        text_content = f"{title} {description}"
-        
-        # Check for exclusion keywords first
-        for exclude_word in self.tech_keywords['exclude_keywords']:
-            if exclude_word in text_content:
-                return False
-        
-        # Check for high priority tech keywords
-        tech_score = 0
-        for keyword in self.tech_keywords['high_priority']:
-            if keyword in text_content:
-                tech_score += 2
-        
-        # Check for science keywords
-        for keyword in self.tech_keywords['science_keywords']:
-            if keyword in text_content:
-                tech_score += 1
-                
-        # Article is tech-related if score is >= 1
-        return tech_score >= 1
+    @staticmethod
+    def _compile_keywords(keywords: List[str]) -> re.Pattern:
+        """Compile keywords into one substring-matching bytes regex, longest first."""
+        ordered = sorted(set(keywords), key=len, reverse=True)
+        return re.compile(b'|'.join(re.escape(keyword.encode('utf-8')) for keyword in ordered))
     
-    def _retry_request(self, func, max_retries=3):
-        """Execute function with exponential backoff retry logic."""
-        for attempt in range(max_retries):
-            try:
-                return func()
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise e
-                wait_time = 2 ** attempt
-                print(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
-                time.sleep(wait_time)
+    def filter_tech_related(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Keep only tech/AI/science related articles.
+        
+        All titles and descriptions are joined into one newline-separated
+        UTF-8 buffer, lowercased with a single ASCII translate, and each keyword
+        pattern is run over it once; match offsets are mapped back to article
+        indices through the text boundaries.
+        
+        Args:
+            articles: List of article dictionaries
+            
+        Returns:
+            Articles with a tech keyword and no exclusion keyword
+        """
+        texts = [
+            f"{article.get('title', '')} {article.get('description', '')}".encode('utf-8', 'ignore')
+            for article in articles
+        ]
+        
+        # starts[i] is the byte offset of article i in the joined text; keywords
+        # never contain the separator, so no match can span two articles
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        text_content = b"\n".join(texts).translate(_LOWER_TABLE)
+        
+        def _matched_articles(pattern: re.Pattern) -> set:
+            return {bisect_right(starts, match.start()) - 1
+                    for match in pattern.finditer(text_content)}
+        
+        excluded = _matched_articles(self._exclude_pattern)
+        tech_related = _matched_articles(self._tech_pattern) - excluded
+        
+        return [article for i, article in enumerate(articles) if i in tech_related]
     
     def fetch_newsapi(self, date: str) -> List[Dict]:
-        """Fetch tech/AI/science news from NewsAPI for a specific date."""
+        """Fetch tech/AI/science news candidates from NewsAPI for a specific date."""
         if not self.newsapi_key:
             print("Warning: NEWSAPI_KEY not found in environment")
             return []
@@ -118,7 +167,7 @@ class NewsFetcher:
             
             articles = []
             for article in data.get('articles', []):
-                if article.get('title') and article.get('url') and self._is_tech_related(article):
+                if article.get('title') and article.get('url'):
                     articles.append({
                         'title': article['title'],
                         'url': article['url'],
@@ -130,13 +179,13 @@ class NewsFetcher:
             return articles
         
         try:
-            return self._retry_request(_fetch)
+            return _fetch()
         except Exception as e:
             print(f"Failed to fetch from NewsAPI: {e}")
             return []
     
     def fetch_guardian(self, date: str) -> List[Dict]:
-        """Fetch tech/science news from Guardian API for a specific date."""
+        """Fetch tech/science news candidates from Guardian API for a specific date."""
         if not self.guardian_key:
             print("Warning: GUARDIAN_API_KEY not found in environment")
             return []
@@ -168,20 +217,124 @@ class NewsFetcher:
                     'source': 'The Guardian',
                     'description': fields.get('trailText', '')[:200]
                 }
-                
-                if self._is_tech_related(article_data):
-                    articles.append(article_data)
+                articles.append(article_data)
             
             return articles
         
         try:
-            return self._retry_request(_fetch)
+            return _fetch()
         except Exception as e:
             print(f"Failed to fetch from Guardian: {e}")
             return []
     
+    @staticmethod
+    def _parse_entry_date(value: Optional[str]) -> Optional[date_type]:
+        """Parse an RFC 822 (RSS) or ISO 8601 (Atom) timestamp into a UTC date."""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                return None
+        if parsed.tzinfo:
+            parsed = parsed.astimezone(timezone.utc)
+        return parsed.date()
+    
+    def _parse_feed_xml(self, content: bytes) -> Tuple[str, List[Dict]]:
+        """
+        Stream-parse an RSS 2.0, RSS 1.0 or Atom feed with lxml.
+        
+        Only the fields used downstream are extracted, each entry element is
+        cleared once read, and parsing stops after MAX_FEED_ENTRIES entries.
+        
+        Args:
+            content: Raw feed bytes
+            
+        Returns:
+            Tuple of (feed title, list of entry dictionaries)
+        """
+        feed_title = None
+        entries = []
+        
+        for _, elem in etree.iterparse(BytesIO(content), events=('end',),
+                                       resolve_entities=False):
+            if not isinstance(elem.tag, str):
+                continue  # Comments and processing instructions
+            tag = etree.QName(elem).localname
+            
+            if tag == 'title' and feed_title is None:
+                parent = elem.getparent()
+                if parent is not None and etree.QName(parent).localname in ('channel', 'feed'):
+                    feed_title = (elem.text or '').strip()
+                continue
+            
+            if tag not in ('item', 'entry'):
+                continue
+            
+            fields = {}
+            link = ''
+            for child in elem:
+                if not isinstance(child.tag, str):
+                    continue
+                name = etree.QName(child).localname
+                if name == 'link':
+                    # RSS puts the URL in the text, Atom in the href attribute
+                    href = child.get('href')
+                    if href is None:
+                        link = link or (child.text or '').strip()
+                    elif child.get('rel', 'alternate') == 'alternate' and not link:
+                        link = href
+                elif name not in fields:
+                    fields[name] = ''.join(child.itertext()).strip()
+            
+            published = (fields.get('pubDate') or fields.get('published')
+                         or fields.get('updated') or fields.get('date') or '')
+            entries.append({
+                'title': fields.get('title', ''),
+                'link': link,
+                'published': published,
+                'summary': fields.get('description') or fields.get('summary') or '',
+                'pub_date': self._parse_entry_date(published)
+            })
+            
+            # Release the parsed entry to keep memory flat
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+            
+            if len(entries) >= MAX_FEED_ENTRIES:
+                break
+        
+        return feed_title or 'Unknown', entries
+    
+    def _parse_feed_fallback(self, content: bytes) -> Tuple[str, List[Dict]]:
+        """Parse a malformed feed with feedparser's tolerant parser."""
+        feed_data = feedparser.parse(content)
+        
+        entries = []
+        for entry in feed_data.entries[:MAX_FEED_ENTRIES]:
+            pub_date = None
+            if entry.get('published_parsed'):
+                pub_date = datetime(*entry.published_parsed[:6]).date()
+            elif entry.get('updated_parsed'):
+                pub_date = datetime(*entry.updated_parsed[:6]).date()
+            
+            entries.append({
+                'title': entry.get('title', ''),
+                'link': entry.get('link', ''),
+                'published': entry.get('published', entry.get('updated', '')),
+                'summary': entry.get('summary', entry.get('description', '')),
+                'pub_date': pub_date
+            })
+        
+        return feed_data.feed.get('title', 'Unknown'), entries
+    
     def fetch_rss_feeds(self, date: str) -> List[Dict]:
-        """Fetch tech/AI/science news from RSS feeds for a specific date."""
+        """Fetch tech/AI/science news candidates from RSS feeds for a specific date."""
         rss_feeds = [
             'https://feeds.bbci.co.uk/news/technology/rss.xml',
             'https://feeds.reuters.com/reuters/technologyNews',
@@ -199,66 +352,87 @@ class NewsFetcher:
         def _fetch_feed(feed_url):
             response = self.session.get(feed_url, timeout=30)
             response.raise_for_status()
-            return feedparser.parse(response.content)
+            try:
+                return self._parse_feed_xml(response.content)
+            except etree.XMLSyntaxError as e:
+                print(f"Malformed XML in {feed_url} ({e}), falling back to feedparser")
+                return self._parse_feed_fallback(response.content)
         
-        articles = []
         target_date = datetime.strptime(date, '%Y-%m-%d').date()
         
-        for feed_url in rss_feeds:
+        def _fetch_feed_articles(feed_url):
+            feed_articles = []
             try:
-                feed_data = self._retry_request(lambda: _fetch_feed(feed_url))
+                feed_title, entries = _fetch_feed(feed_url)
                 
-                for entry in feed_data.entries[:20]:  # Limit per feed
-                    # Parse publication date
-                    pub_date = None
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        pub_date = datetime(*entry.published_parsed[:6]).date()
-                    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                        pub_date = datetime(*entry.updated_parsed[:6]).date()
-                    
+                for entry in entries:
                     # Filter by date (allow ±1 day tolerance)
+                    pub_date = entry['pub_date']
                     if pub_date and abs((pub_date - target_date).days) <= 1:
-                        article_data = {
-                            'title': entry.get('title', ''),
-                            'url': entry.get('link', ''),
-                            'published_at': entry.get('published', entry.get('updated', '')),
-                            'source': f"RSS - {feed_data.feed.get('title', 'Unknown')}",
-                            'description': entry.get('summary', entry.get('description', ''))[:200]
-                        }
-                        
-                        # Only add if tech-related
-                        if self._is_tech_related(article_data):
-                            articles.append(article_data)
+                        feed_articles.append({
+                            'title': entry['title'],
+                            'url': entry['link'],
+                            'published_at': entry['published'],
+                            'source': f"RSS - {feed_title}",
+                            'description': entry['summary'][:200]
+                        })
                         
             except Exception as e:
                 print(f"Failed to fetch RSS feed {feed_url}: {e}")
-                continue
+            
+            return feed_articles
+        
+        # Feeds are independent HTTP round-trips, so fetch them concurrently;
+        # results are collected in feed order to keep the output deterministic
+        articles = []
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for feed_articles in executor.map(_fetch_feed_articles, rss_feeds):
+                articles.extend(feed_articles)
         
         return articles
     
+    @staticmethod
+    def write_articles_json(output_file: str, articles: Iterable[Dict]):
+        """
+        Stream articles to a JSON array file one entry at a time.
+        
+        Produces the same bytes as dumping the whole list with OPT_INDENT_2,
+        but only one serialized article is held in memory at a time.
+        
+        Args:
+            output_file: Path to output JSON file
+            articles: Iterable of article dictionaries
+        """
+        with open(output_file, 'wb') as f:
+            f.write(b'[')
+            separator = b'\n  '
+            for article in articles:
+                # JSON strings never contain raw newlines, so re-indenting
+                # the serialized object by two spaces is safe
+                f.write(separator)
+                f.write(orjson.dumps(article, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+                separator = b',\n  '
+            f.write(b'\n]' if separator != b'\n  ' else b']')
+    
     def fetch_all_sources(self, date: str) -> List[Dict]:
         """Fetch news from all sources and combine results."""
         print(f"Fetching news for {date}...")
         
-        all_articles = []
-        
-        # Fetch from NewsAPI
-        print("Fetching from NewsAPI...")
-        newsapi_articles = self.fetch_newsapi(date)
-        all_articles.extend(newsapi_articles)
-        print(f"NewsAPI: {len(newsapi_articles)} articles")
-        
-        # Fetch from Guardian
-        print("Fetching from Guardian...")
-        guardian_articles = self.fetch_guardian(date)
-        all_articles.extend(guardian_articles)
-        print(f"Guardian: {len(guardian_articles)} articles")
+        # The sources share no state, so fetch them concurrently and merge
+        # the results in a fixed order (NewsAPI, Guardian, RSS)
+        sources = [
+            ("NewsAPI", self.fetch_newsapi),
+            ("Guardian", self.fetch_guardian),
+            ("RSS feeds", self.fetch_rss_feeds)
+        ]
         
-        # Fetch from RSS feeds
-        print("Fetching from RSS feeds...")
-        rss_articles = self.fetch_rss_feeds(date)
-        all_articles.extend(rss_articles)
-        print(f"RSS feeds: {len(rss_articles)} articles")
+        all_articles = []
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = [(name, executor.submit(fetch, date)) for name, fetch in sources]
+            for name, future in futures:
+                source_articles = future.result()
+                all_articles.extend(source_articles)
+                print(f"{name}: {len(source_articles)} articles")
         
         # Filter out articles with missing required fields
         valid_articles = []
@@ -266,12 +440,14 @@ class NewsFetcher:
             if article.get('title') and article.get('url') and article.get('source'):
                 valid_articles.append(article)
         
+        # Keep only tech-related articles, scoring the whole batch in one pass
+        valid_articles = self.filter_tech_related(valid_articles)
+        
         print(f"Total valid articles: {len(valid_articles)}")
         
         # Save to JSON file
         output_file = f"raw_{date}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(valid_articles, f, ensure_ascii=False, indent=2)
+        self.write_articles_json(output_file, valid_articles)
         
         print(f"Results saved to {output_file}")
         return valid_articles
@@ -286,11 +462,7 @@ def main():
     date = sys.argv[1]
     
     # Validate date format
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        print("Error: Date must be in YYYY-MM-DD format")
-        sys.exit(1)
+    parse_date_or_exit(date)
     
     fetcher = NewsFetcher()
     articles = fetcher.fetch_all_sources(date)
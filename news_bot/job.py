@@ -7,29 +7,48 @@ import argparse
 import sys
 import time
 import os
+import threading
 from datetime import datetime, date
 from pathlib import Path
+from typing import List, Dict, Optional
+
+import orjson
 
 # Import all pipeline modules
 from .fetcher import NewsFetcher
 from .dedup import NewsDeduplicator
 from .summarizer import NewsSummarizer
+from .llm_cache import LLM_CACHE_FILE
 from .writer import NewsWriter
 from .publisher import NewsPublisher
 
 
 class NewsJob:
-    def __init__(self, target_date: str, dry_run: bool = False):
+    def __init__(self, target_date: str, dry_run: bool = False,
+                 publisher: Optional[NewsPublisher] = None, use_llm_cache: bool = True):
         """
         Initialize the news processing job.
         
         Args:
             target_date: Date string in YYYY-MM-DD format
             dry_run: If True, skip the publisher step
+            publisher: Shared publisher to queue the update on; the caller is
+                then responsible for publisher.flush(). If None, the update
+                is published immediately.
+            use_llm_cache: Reuse cached LLM summaries from earlier runs
         """
         self.target_date = target_date
         self.dry_run = dry_run
+        self.publisher = publisher
+        self.use_llm_cache = use_llm_cache
         self.total_start_time = time.time()
+        # Created on first use and kept so retries reuse the loaded model
+        self.deduplicator = None
+        # Output of the last completed step, handed to the next step in-process
+        self.articles: Optional[List[Dict]] = None
+        # Files the writer produced; the publisher stages only these
+        self.written_paths: List[str] = []
+        self._pending_writes: List[threading.Thread] = []
         
         print(f"🚀 Starting news processing job for {target_date}")
         if dry_run:
@@ -43,20 +62,43 @@ class NewsJob:
         print(f"{status} {step_name} completed in {duration:.2f}s")
         print()
     
+    def save_json_async(self, output_file: str, articles: List[Dict]):
+        """
+        Save a step's articles as an NDJSON debug artifact in the background.
+        
+        Serialization happens on the calling thread so later steps may safely
+        modify the articles; only the file write is offloaded.
+        
+        Args:
+            output_file: Path to output NDJSON file
+            articles: Articles to save
+        """
+        payload = b''.join(orjson.dumps(article) + b'\n' for article in articles)
+        
+        def _write():
+            with open(output_file, 'wb') as f:
+                f.write(payload)
+        
+        thread = threading.Thread(target=_write, name=f"save-{output_file}")
+        thread.start()
+        self._pending_writes.append(thread)
+    
+    def wait_for_pending_writes(self):
+        """Block until all background JSON writes have finished."""
+        for thread in self._pending_writes:
+            thread.join()
+        self._pending_writes.clear()
+    
     def run_fetcher(self) -> bool:
         """Execute the fetcher step."""
         print("=== Step 1: News Fetching ===")
         start_time = time.time()
         
         try:
+            # fetch_all_sources saves raw_{date}.json itself
             fetcher = NewsFetcher()
             articles = fetcher.fetch_all_sources(self.target_date)
-            
-            # Save to file
-            output_file = f"raw_{self.target_date}.json"
-            import json
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=2)
+            self.articles = articles
             
             print(f"Fetched {len(articles)} articles")
             self.log_step("News Fetching", start_time)
@@ -73,11 +115,17 @@ class NewsJob:
         start_time = time.time()
         
         try:
-            input_file = f"raw_{self.target_date}.json"
+            # Prefer the fetcher's in-memory output over re-reading raw_{date}.json
+            input_articles = self.articles
+            if input_articles is None:
+                input_articles = f"raw_{self.target_date}.json"
             output_file = f"dedup_{self.target_date}.json"
             
-            deduplicator = NewsDeduplicator()
-            unique_articles = deduplicator.deduplicate_articles(input_file, output_file)
+            if self.deduplicator is None:
+                self.deduplicator = NewsDeduplicator()
+            unique_articles = self.deduplicator.deduplicate_articles(input_articles)
+            self.articles = unique_articles
+            self.save_json_async(output_file, unique_articles)
             
             print(f"Deduplicated to {len(unique_articles)} unique articles")
             self.log_step("Deduplication", start_time)
@@ -94,16 +142,22 @@ class NewsJob:
         start_time = time.time()
         
         try:
-            # Use dedup file if selector not implemented
-            input_file = f"select_{self.target_date}.json"
-            if not os.path.exists(input_file):
-                input_file = f"dedup_{self.target_date}.json"
-                print(f"Using {input_file} (selector not implemented)")
+            # Use dedup output if selector not implemented
+            input_articles = f"select_{self.target_date}.json"
+            if not os.path.exists(input_articles):
+                if self.articles is not None:
+                    input_articles = self.articles
+                    print("Using deduplicated articles (selector not implemented)")
+                else:
+                    input_articles = f"dedup_{self.target_date}.json"
+                    print(f"Using {input_articles} (selector not implemented)")
             
             output_file = f"summary_{self.target_date}.json"
             
-            summarizer = NewsSummarizer()
-            summarized_articles = summarizer.summarize_articles(input_file, output_file)
+            summarizer = NewsSummarizer(cache_file=LLM_CACHE_FILE if self.use_llm_cache else None)
+            summarized_articles = summarizer.summarize_articles(input_articles)
+            self.articles = summarized_articles
+            self.save_json_async(output_file, summarized_articles)
             
             print(f"Summarized {len(summarized_articles)} articles")
             print(f"Token usage: {summarizer.total_tokens_used}")
@@ -121,10 +175,13 @@ class NewsJob:
         start_time = time.time()
         
         try:
-            input_file = f"summary_{self.target_date}.json"
+            input_articles = self.articles
+            if input_articles is None:
+                input_articles = f"summary_{self.target_date}.json"
             
             writer = NewsWriter()
-            output_file = writer.write_markdown_file(input_file, self.target_date)
+            output_file = writer.write_markdown_file(input_articles, self.target_date)
+            self.written_paths.append(output_file)
             
             print(f"Generated markdown file: {output_file}")
             self.log_step("Markdown Generation", start_time)
@@ -143,11 +200,16 @@ class NewsJob:
         try:
             commit_msg = f"Add daily news for {self.target_date} - Auto-generated content"
             
-            publisher = NewsPublisher()
-            success = publisher.publish(commit_msg, auto_push=True)
+            paths = self.written_paths or None
+            if self.publisher is not None:
+                # Batched: stage now, the caller commits and deploys on flush()
+                success = self.publisher.stage_only(commit_msg, paths=paths)
+            else:
+                success = NewsPublisher().publish(commit_msg, auto_push=True, paths=paths)
             
             if success:
-                print("Successfully published to blog repository")
+                if self.publisher is None:
+                    print("Successfully published to blog repository")
                 self.log_step("Git Publishing", start_time)
                 return True
             else:
@@ -177,10 +239,13 @@ class NewsJob:
             print()
         
         # Execute all steps
-        for step_name, step_func in steps:
-            if not step_func():
-                print(f"❌ Pipeline failed at {step_name} step")
-                return False
+        try:
+            for step_name, step_func in steps:
+                if not step_func():
+                    print(f"❌ Pipeline failed at {step_name} step")
+                    return False
+        finally:
+            self.wait_for_pending_writes()
         
         # Calculate total time
         total_duration = time.time() - self.total_start_time
@@ -189,6 +254,8 @@ class NewsJob:
         
         if self.dry_run:
             print("🔍 This was a dry-run. No changes were published.")
+        elif self.publisher is not None:
+            print("📦 Changes have been staged and queued for the next batched publish.")
         else:
             print("📝 Changes have been committed and pushed to the blog repository.")
             
@@ -204,6 +271,7 @@ def main():
 Examples:
   python -m news_bot.job --date 2025-07-25
   python -m news_bot.job --date 2025-07-25 --dry-run
+  python -m news_bot.job --date 2025-07-25 --no-cache
   python -m news_bot.job  # Uses today's date
         """
     )
@@ -220,6 +288,12 @@ Examples:
         help="Skip the publisher step (for testing)"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached LLM summaries and call the API for every article"
+    )
+    
     args = parser.parse_args()
     
     # Validate date format
@@ -236,7 +310,7 @@ Examples:
         sys.exit(1)
     
     try:
-        job = NewsJob(args.date, args.dry_run)
+        job = NewsJob(args.date, args.dry_run, use_llm_cache=not args.no_cache)
         success = job.run_pipeline()
         
         sys.exit(0 if success else 1)
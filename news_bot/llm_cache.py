@@ -0,0 +1,104 @@
+"""
+Persistent SQLite cache for LLM responses.
+Entries are keyed by a hash of everything that determines the response
+(model, prompts, prompt version) and expire after a TTL.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import orjson
+
+LLM_CACHE_FILE = '_llm_cache.sqlite'
+# Responses older than this are treated as misses and overwritten
+DEFAULT_TTL_SECONDS = 7 * 86400
+
+
+class LLMCache:
+    def __init__(self, cache_file: str = LLM_CACHE_FILE, ttl: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache; the database is opened on first use.
+        
+        Args:
+            cache_file: SQLite file holding cached responses
+            ttl: Default lifetime of an entry in seconds
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(**payload) -> str:
+        """
+        Build a cache key from the inputs that determine a response.
+        
+        Args:
+            **payload: JSON-serializable request fields (model, prompts, ...)
+        
+        Returns:
+            Hex SHA-256 of the canonical JSON encoding of the payload
+        """
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database, creating the table if needed."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.cache_file, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Key from make_key()
+        
+        Returns:
+            The stored value, or None if absent or expired
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM responses WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return orjson.loads(row[0])
+    
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None):
+        """
+        Store a response.
+        
+        Args:
+            key: Key from make_key()
+            value: JSON-serializable response data
+            ttl: Lifetime in seconds (defaults to the cache's ttl)
+        """
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (key, orjson.dumps(value), expires)
+                )
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -3,13 +3,350 @@ Git publisher for automated commits and pushes.
 Handles automatic Git operations for news content publishing.
 """
 
+import asyncio
+import atexit
+import hashlib
 import subprocess
 import sys
 import os
 import json
-from datetime import datetime
+import mmap
+import select
+import selectors
+import shlex
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Mapping, Set, Tuple
+
+from ._config import load_config
+
+
+# add → check → commit as one shell script. Sections are delimited by marker
+# lines for logging, and the exit code identifies the step that failed.
+# `git add --verbose` is the only worktree walk: it prints what it staged, and
+# only when it staged nothing does `git diff --cached --quiet` check for
+# changes that were already in the index. The commit message is passed as $1
+# so it never needs shell quoting; an optional NUL-separated pathspec file in
+# $2 limits staging to those paths.
+_COMMIT_ALL_SCRIPT = """
+echo '---ADD---'
+if [ -n "$2" ]; then
+    added=$(git add --verbose --pathspec-from-file="$2" --pathspec-file-nul) || exit 1
+else
+    added=$(git add -A --verbose .) || exit 1
+fi
+if [ -z "$added" ]; then
+    git diff --cached --quiet
+    case $? in
+        0) echo '---CLEAN---'; exit 0 ;;
+        1) ;;
+        *) exit 2 ;;
+    esac
+fi
+echo '---STAGED---'
+[ -n "$added" ] && printf '%s\n' "$added"
+echo '---COMMIT---'
+printf '%s' "$1" | git commit --allow-empty-message -F - || exit 3
+"""
+_COMMIT_ALL_STEPS = {1: "stage", 2: "diff", 3: "commit"}
+WATERMARK_FILE = ".publish_watermark.json"
+# Lines of streamed output kept for error inspection (git's verdict comes last)
+STREAM_TAIL_LINES = 200
+# Network git commands must fail rather than wait for credentials: the
+# scheduler runs with no terminal and no one to answer a prompt
+_NONINTERACTIVE_GIT_ENV = {
+    "GIT_TERMINAL_PROMPT": "0",
+    "GIT_ASKPASS": "true",
+    "GIT_OPTIONAL_LOCKS": "0",
+}
+# Quiet flags for fetch/pull/push; push adds --porcelain for parseable results
+_REMOTE_QUIET_FLAGS = ["--no-progress", "--quiet"]
+
+# Resolved start directory -> (git root, git dir, git common dir, cdup), shared
+# by all publishers so a long-running scheduler discovers the repository once.
+# Entries found by the fallback walk carry None for everything but the root.
+_GIT_ROOT_CACHE: Dict[str, Tuple[Path, Optional[str], Optional[Path], Optional[str]]] = {}
+
+# git dir -> long-lived `git cat-file --batch-check` reader, kept for the
+# process lifetime (the scheduler's, in daemon mode)
+_OBJECT_READERS: Dict[str, "_GitObjectReader"] = {}
+_OBJECT_READERS_LOCK = threading.Lock()
+
+# Warm node deploy worker shared by all publishers in this process
+_DEPLOY_WORKER: Optional[subprocess.Popen] = None
+_DEPLOY_WORKER_LOCK = threading.Lock()
+
+
+def clear_git_root_cache():
+    """Forget cached git root lookups (e.g. after moving or re-cloning the blog)."""
+    _GIT_ROOT_CACHE.clear()
+
+
+def _spawn_run(args: List[str], input: Optional[str] = None, check: bool = True,
+               text: bool = True, env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+    """
+    Run a command via os.posix_spawnp, the subprocess.run equivalent for git.
+    
+    posix_spawn avoids fork's page-table copy, which matters when the
+    publisher shares a process with large loaded models. Python exposes no
+    chdir file action, so callers pass `git -C <dir>` instead of a cwd.
+    Falls back to subprocess.run where posix_spawnp is unavailable.
+    
+    Args:
+        args: Command and arguments; args[0] is looked up on PATH
+        input: Text fed to the command's stdin
+        check: Raise CalledProcessError on a non-zero exit code
+        text: Decode stdout and stderr; pass False when only the exit code
+            or emptiness of the output matters
+        env: Environment for the command (defaults to the current one)
+        
+    Returns:
+        CompletedProcess with decoded (or raw bytes) stdout and stderr
+    """
+    if not hasattr(os, "posix_spawnp"):
+        return subprocess.run(
+            args, input=input.encode() if input is not None and not text else input,
+            capture_output=True, text=text, check=check, env=env
+        )
+    
+    stdin_r, stdin_w = os.pipe()
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    try:
+        # os.pipe() fds are close-on-exec; dup2 onto 0/1/2 makes only those inherited
+        pid = os.posix_spawnp(args[0], args, os.environ if env is None else env, file_actions=[
+            (os.POSIX_SPAWN_DUP2, stdin_r, 0),
+            (os.POSIX_SPAWN_DUP2, out_w, 1),
+            (os.POSIX_SPAWN_DUP2, err_w, 2),
+        ])
+    except OSError:
+        for fd in (stdin_w, out_r, err_r):
+            os.close(fd)
+        raise
+    finally:
+        for fd in (stdin_r, out_w, err_w):
+            os.close(fd)
+    
+    # Multiplex stdin/stdout/stderr so no pipe can fill up and deadlock
+    data = input.encode() if input else b""
+    offset = 0
+    chunks = {out_r: [], err_r: []}
+    with selectors.DefaultSelector() as selector:
+        for fd in chunks:
+            selector.register(fd, selectors.EVENT_READ)
+        if data:
+            selector.register(stdin_w, selectors.EVENT_WRITE)
+        else:
+            os.close(stdin_w)
+        
+        while selector.get_map():
+            for key, _ in selector.select():
+                fd = key.fd
+                if fd == stdin_w:
+                    try:
+                        offset += os.write(fd, data[offset:offset + select.PIPE_BUF])
+                    except BrokenPipeError:
+                        offset = len(data)
+                    if offset >= len(data):
+                        selector.unregister(fd)
+                        os.close(fd)
+                else:
+                    chunk = os.read(fd, 65536)
+                    if chunk:
+                        chunks[fd].append(chunk)
+                    else:
+                        selector.unregister(fd)
+                        os.close(fd)
+    
+    _, status = os.waitpid(pid, 0)
+    returncode = os.waitstatus_to_exitcode(status)
+    stdout = b"".join(chunks[out_r])
+    stderr = b"".join(chunks[err_r])
+    if text:
+        stdout = stdout.decode("utf-8", "replace")
+        stderr = stderr.decode("utf-8", "replace")
+    
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+
+class _GitObjectReader:
+    """
+    A long-lived `git cat-file --batch-check` process for read-only lookups.
+    
+    Each query is one line written to the process instead of a new git
+    process, so repeated ref and object lookups skip fork, exec and startup.
+    """
+    
+    def __init__(self, git_args: List[str]):
+        self.git_args = git_args
+        self._proc = None
+        self._lock = threading.Lock()
+    
+    def _ensure_running(self) -> subprocess.Popen:
+        """Start the cat-file process, or restart it if it exited."""
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                self.git_args + ["cat-file", "--batch-check=%(objectname) %(objecttype) %(objectsize)"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0
+            )
+        return self._proc
+    
+    def query(self, rev: str) -> bytes:
+        """
+        Look up one revision or object.
+        
+        Args:
+            rev: Any revision cat-file accepts, e.g. "refs/heads/main" or "HEAD:path"
+            
+        Returns:
+            b"<sha> <type> <size>" or b"<rev> missing" (without newline)
+        """
+        with self._lock:
+            proc = self._ensure_running()
+            proc.stdin.write(rev.encode() + b"\n")
+            line = proc.stdout.readline()
+            if not line:
+                self.close()
+                raise RuntimeError("git cat-file exited unexpectedly")
+            return line.rstrip(b"\n")
+    
+    def close(self):
+        """Stop the process by closing its stdin."""
+        if self._proc:
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+            self._proc = None
+
+
+def close_object_readers():
+    """Stop every persistent cat-file reader; registered with atexit."""
+    with _OBJECT_READERS_LOCK:
+        for reader in _OBJECT_READERS.values():
+            reader.close()
+        _OBJECT_READERS.clear()
+
+
+atexit.register(close_object_readers)
+
+
+class _GitSession:
+    """
+    A single long-lived shell that runs git commands for one publish.
+    
+    Commands are written to the shell's stdin, each followed by a sentinel
+    line carrying the exit code, so the Python process forks once per publish
+    instead of once per git command.
+    """
+    
+    def __init__(self, cwd: str, env: Optional[Dict[str, str]] = None):
+        self.cwd = cwd
+        self.env = env
+        self._proc = None
+        self._marker = f"__GIT_SESSION_END_{uuid.uuid4().hex}__".encode()
+        self._stderr_path = None
+    
+    def __enter__(self) -> "_GitSession":
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def open(self):
+        """Start the shell process."""
+        fd, self._stderr_path = tempfile.mkstemp(prefix="git-session-", suffix=".err")
+        os.close(fd)
+        self._proc = subprocess.Popen(
+            ["bash", "--noprofile", "--norc", "-s"],
+            cwd=self.cwd,
+            env=self.env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+    
+    def close(self):
+        """Stop the shell process and remove its stderr scratch file."""
+        if self._proc:
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+            self._proc = None
+        if self._stderr_path:
+            try:
+                os.remove(self._stderr_path)
+            except OSError:
+                pass
+            self._stderr_path = None
+    
+    def run(self, args: List[str], check: bool = True, input: Optional[str] = None,
+            text: bool = True) -> subprocess.CompletedProcess:
+        """
+        Run one command in the session.
+        
+        Args:
+            args: Command argument list, e.g. ["git", "status", "--porcelain"]
+            check: Raise CalledProcessError on a non-zero exit code
+            input: Text fed to the command's stdin through a here-document
+            text: Decode stdout and stderr (raw bytes if False)
+            
+        Returns:
+            CompletedProcess with decoded (or raw bytes) stdout and stderr
+        """
+        if self._proc is None or self._proc.poll() is not None:
+            raise RuntimeError("git session is not running")
+        
+        command = " ".join(shlex.quote(arg) for arg in args)
+        marker = self._marker.decode()
+        # stdin is detached (or a quoted here-document) so git can never block
+        # waiting for input; the printf always starts on a new line so the
+        # sentinel is easy to find
+        status = f"printf '\\n{marker}:%d\\n' $?"
+        stderr_redirect = f"2>{shlex.quote(self._stderr_path)}"
+        if input is None:
+            script = f"{command} </dev/null {stderr_redirect}; {status}\n"
+        else:
+            delimiter = f"__GIT_SESSION_INPUT_{uuid.uuid4().hex}__"
+            script = (f"{command} {stderr_redirect} <<'{delimiter}'; {status}\n"
+                      f"{input}\n{delimiter}\n")
+        self._proc.stdin.write(script.encode())
+        self._proc.stdin.flush()
+        
+        chunks = []
+        while True:
+            line = self._proc.stdout.readline()
+            if not line:
+                raise RuntimeError("git session terminated unexpectedly")
+            if line.startswith(self._marker + b":"):
+                returncode = int(line[len(self._marker) + 1:])
+                break
+            chunks.append(line)
+        
+        # Drop the newline that printf emitted before the sentinel
+        stdout = b"".join(chunks)[:-1]
+        with open(self._stderr_path, "rb") as f:
+            stderr = f.read()
+        if text:
+            stdout = stdout.decode("utf-8", "replace")
+            stderr = stderr.decode("utf-8", "replace")
+        
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+        return subprocess.CompletedProcess(args, returncode, stdout, stderr)
 
 
 class NewsPublisher:
@@ -22,29 +359,58 @@ class NewsPublisher:
             config_file: Path to configuration file
         """
         self.config = self.load_config(config_file)
+        # Blog content directory, resolved once from the config
+        self._blog_dir = self._resolve_blog_directory()
+        # Publish watermark lives next to the config file
+        self.watermark_file = Path(config_file).parent / WATERMARK_FILE
+        # Shared .git directory (differs from repo_path/.git in a worktree)
+        self.git_common_dir: Optional[Path] = None
+        # This worktree's git dir and top level, passed to git so it skips its
+        # own discovery; None when rev-parse could not resolve them
+        self._git_dir: Optional[str] = None
+        self._work_tree: Optional[str] = None
+        # Relative path from the start directory up to the top level
+        self._cdup: Optional[str] = None
         
         if repo_path:
             self.repo_path = Path(repo_path)
+            discovered = self._discover_repo(repo_path)
+            if discovered is not None:
+                self._set_repo_dirs(discovered)
         else:
             # Get blog directory from config and find git root
             blog_dir = self.get_blog_directory()
             self.repo_path = self.find_git_root(blog_dir)
+        # Stringified once; used as the cwd of every spawned command
+        self._repo_path_str = str(self.repo_path.resolve())
         
         # Get git configuration
         self.git_config = self.config.get("git_config", {})
         self.target_branch = self.git_config.get("target_branch", "gh-pages")
         self.auto_switch_branch = self.git_config.get("auto_switch_branch", True)
         self.push_to_remote = self.git_config.get("push_to_remote", True)
+        # Optional long-lived node script that replaces `npm run deploy`
+        self.deploy_worker = self.git_config.get("deploy_worker")
+            
+        # Persistent shell used by publish(); None outside a publish
+        self._git = None
+        # Local branch names, read once with for-each-ref
+        self._local_branches: Optional[Set[str]] = None
+        # Current branch as last read or switched to by this publisher
+        self._current_branch_cache: Optional[str] = None
+        # Updates staged by stage_only() and not yet committed by flush()
+        self._pending: List[Tuple[str, Optional[List[str]]]] = []
+        self._pending_since: Optional[float] = None
+        self._pending_lock = threading.Lock()
             
         print(f"Publisher will operate in git repository: {self.repo_path}")
         print(f"Target branch: {self.target_branch}")
         print(f"Auto switch branch: {self.auto_switch_branch}")
     
-    def load_config(self, config_file: str) -> Dict:
+    def load_config(self, config_file: str) -> Mapping:
         """Load configuration from JSON file."""
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_config(config_file)
         except FileNotFoundError:
             print(f"Warning: Config file {config_file} not found, using defaults")
             return {
@@ -59,8 +425,8 @@ class NewsPublisher:
                 }
             }
     
-    def get_blog_directory(self) -> Path:
-        """Get the blog directory from configuration."""
+    def _resolve_blog_directory(self) -> Path:
+        """Compute the absolute blog directory from configuration."""
         output_config = self.config.get("output_config", {})
         
         if output_config.get("use_blog_dir", False):
@@ -68,7 +434,57 @@ class NewsPublisher:
         else:
             blog_dir = output_config.get("local_content_dir", "content/news")
             
-        return Path(blog_dir)
+        return Path(blog_dir).resolve()
+    
+    def get_blog_directory(self) -> Path:
+        """Get the blog directory from configuration."""
+        return self._blog_dir
+    
+    @staticmethod
+    def _discover_repo(start_path) -> Optional[Tuple[Path, Optional[str], Optional[Path], Optional[str]]]:
+        """
+        Resolve the repository layout for a directory with one rev-parse call.
+        
+        Args:
+            start_path: Directory inside the repository
+            
+        Returns:
+            (top level, git dir, git common dir, cdup), or None if git cannot
+            resolve it
+        """
+        start_key = os.path.realpath(start_path)
+        cached = _GIT_ROOT_CACHE.get(start_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            result = _spawn_run([
+                "git", "-C", str(start_path), "rev-parse",
+                "--show-toplevel", "--absolute-git-dir", "--git-common-dir", "--show-cdup"
+            ])
+            # --show-cdup prints an empty line at the top level itself
+            toplevel, git_dir, common_dir, cdup = (result.stdout.splitlines() + [""])[:4]
+        except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+            return None
+        
+        discovered = (Path(toplevel), git_dir, (Path(start_path) / common_dir).resolve(), cdup)
+        _GIT_ROOT_CACHE[start_key] = discovered
+        return discovered
+    
+    def _set_repo_dirs(self, discovered: Tuple[Path, Optional[str], Optional[Path], Optional[str]]):
+        """Store a _discover_repo result on the publisher."""
+        toplevel, self._git_dir, self.git_common_dir, self._cdup = discovered
+        self._work_tree = str(toplevel) if self._git_dir else None
+    
+    def _git_env(self) -> Optional[Dict[str, str]]:
+        """Environment pinning GIT_DIR/GIT_WORK_TREE, or None if unknown."""
+        if not self._git_dir:
+            return None
+        return {**os.environ, "GIT_DIR": self._git_dir, "GIT_WORK_TREE": self._work_tree}
+    
+    def _remote_env(self) -> Dict[str, str]:
+        """Environment for commands that talk to the remote: never prompt."""
+        return {**(self._git_env() or os.environ), **_NONINTERACTIVE_GIT_ENV}
     
     def find_git_root(self, start_path: Path) -> Path:
         """
@@ -80,13 +496,31 @@ class NewsPublisher:
         Returns:
             Path to git repository root
         """
-        current_path = Path(start_path).resolve()
+        start_key = os.path.realpath(start_path)
+        discovered = self._discover_repo(start_path)
+        if discovered is not None:
+            self._set_repo_dirs(discovered)
+            return discovered[0]
         
-        # Walk up the directory tree to find .git
-        while current_path != current_path.parent:
-            if (current_path / ".git").exists():
-                return current_path
-            current_path = current_path.parent
+        current_path = start_key
+        visited = []
+        
+        # Walk up the directory tree to find .git (plain strings, one lstat per level)
+        while True:
+            visited.append(current_path)
+            try:
+                os.lstat(os.path.join(current_path, ".git"))
+                # Every directory on the way up shares this root
+                root = Path(current_path)
+                for directory in visited:
+                    _GIT_ROOT_CACHE[directory] = (root, None, None, None)
+                return root
+            except OSError:
+                pass
+            parent = os.path.dirname(current_path)
+            if parent == current_path:
+                break
+            current_path = parent
         
         # If no .git found, try the parent of blog content directory
         # For example: /Users/geyuxu/repo/blog/geyuxu.com/src/content/news -> /Users/geyuxu/repo/blog/geyuxu.com
@@ -98,6 +532,218 @@ class NewsPublisher:
             
         raise FileNotFoundError(f"No git repository found from {start_path} upwards")
         
+    def _run_git(self, args: List[str], check: bool = True, input: Optional[str] = None,
+                 text: bool = True) -> subprocess.CompletedProcess:
+        """
+        Run a git command, through the publish session when one is open.
+        
+        Args:
+            args: Command argument list starting with "git"
+            check: Raise CalledProcessError on a non-zero exit code
+            input: Text fed to the command's stdin
+            text: Decode stdout and stderr; False skips the decode for calls
+                that only look at the exit code or whether output is empty
+            
+        Returns:
+            CompletedProcess with text (or bytes) stdout and stderr
+            
+        Raises:
+            subprocess.CalledProcessError: If the command exits non-zero
+        """
+        if self._git is not None:
+            return self._git.run(args, check=check, input=input, text=text)
+        
+        return _spawn_run(self._git_argv(args[1:]), input=input, check=check, text=text)
+    
+    def _git_argv(self, args: List[str]) -> List[str]:
+        """
+        Build a git argv that needs no cwd and skips repository discovery.
+        
+        posix_spawn has no chdir action, so the repository is given with -C,
+        plus the known git dir and work tree when rev-parse resolved them.
+        
+        Args:
+            args: git arguments, without the leading "git"
+            
+        Returns:
+            Full argument list starting with "git"
+        """
+        argv = ["git", "-C", self._repo_path_str]
+        if self._git_dir:
+            argv += ["--git-dir", self._git_dir, "--work-tree", self._work_tree]
+        return argv + list(args)
+    
+    def _run_streaming(self, args: List[str], input: Optional[str] = None,
+                       env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+        """
+        Run a long command in the repository, echoing its output as it arrives.
+        
+        Lines are passed through as raw bytes and released once written; only
+        the last STREAM_TAIL_LINES are kept (and decoded) for the caller.
+        
+        Args:
+            args: Command and arguments
+            input: Text fed to the command's stdin
+            env: Environment for the command (defaults to the current one)
+            
+        Returns:
+            CompletedProcess whose stdout holds the tail of the combined
+            stdout and stderr
+            
+        Raises:
+            subprocess.CalledProcessError: If the command exits non-zero; its
+                output and stderr both hold the combined output tail
+        """
+        tail = deque(maxlen=STREAM_TAIL_LINES)
+        out = getattr(sys.stdout, "buffer", None)
+        sys.stdout.flush()
+        with subprocess.Popen(
+            args,
+            cwd=self._repo_path_str,
+            stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env
+        ) as proc:
+            if input is not None:
+                proc.stdin.write(input.encode())
+                proc.stdin.close()
+            for line in iter(proc.stdout.readline, b""):
+                if out is not None:
+                    out.write(line)
+                    out.flush()
+                else:
+                    print(line.decode("utf-8", "replace"), end="")
+                tail.append(line)
+            returncode = proc.wait()
+        
+        output = b"".join(tail).decode("utf-8", "replace")
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, args, output=output, stderr=output)
+        return subprocess.CompletedProcess(args, returncode, output, "")
+    
+    def read_repo_status(self) -> Dict:
+        """
+        Read the current branch and working tree changes in one git call.
+        
+        Returns:
+            Dictionary with 'branch', 'upstream' (or None) and 'changes'
+            (porcelain v2 entries)
+            
+        Raises:
+            subprocess.CalledProcessError: If git status fails
+        """
+        # No optional index lock (never stalls on a concurrent fetch), no
+        # ahead/behind walk, and untracked directories are not recursed into
+        result = self._run_git([
+            "git", "--no-optional-locks", "status", "--porcelain=v2", "-z",
+            "--branch", "--no-ahead-behind", "--untracked-files=normal"
+        ])
+        
+        status = {"branch": "HEAD", "upstream": None, "changes": []}
+        entries = iter(result.stdout.split("\0"))
+        for line in entries:
+            if line.startswith("# branch.head "):
+                head = line[len("# branch.head "):]
+                # Detached HEAD reports "(detached)"; rev-parse --abbrev-ref said "HEAD"
+                status["branch"] = "HEAD" if head == "(detached)" else head
+                self._current_branch_cache = status["branch"]
+            elif line.startswith("# branch.upstream "):
+                status["upstream"] = line[len("# branch.upstream "):]
+            elif line and not line.startswith("#"):
+                if line.startswith("2 "):
+                    # Rename/copy entries carry the original path as the next field
+                    line = f"{line} <- {next(entries, '')}"
+                status["changes"].append(line)
+        
+        return status
+    
+    async def _git_async(self, *args: str) -> str:
+        """
+        Run one read-only git command as an asyncio subprocess.
+        
+        Args:
+            args: git arguments, without the leading "git"
+            
+        Returns:
+            Decoded stdout, or "" if the command failed
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *self._git_argv(args),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await proc.communicate()
+        return stdout.decode("utf-8", "replace") if proc.returncode == 0 else ""
+    
+    async def gather_status(self) -> Dict:
+        """
+        Read status, HEAD and the current branch concurrently.
+        
+        The three git processes are independent, so they run side by side and
+        the whole lookup takes as long as the slowest one.
+        
+        Returns:
+            Dictionary with 'branch', 'head' (or None) and 'changes'
+        """
+        status, head, branch = await asyncio.gather(
+            self._git_async("--no-optional-locks", "status", "--porcelain=v1", "-z", "--untracked-files=normal"),
+            self._git_async("rev-parse", "HEAD"),
+            self._git_async("branch", "--show-current")
+        )
+        return {
+            # --show-current prints nothing on a detached HEAD
+            "branch": branch.strip() or "HEAD",
+            "head": head.strip() or None,
+            "changes": [entry for entry in status.split("\0") if entry]
+        }
+    
+    def get_local_branches(self) -> Set[str]:
+        """
+        Get the names of local branches, cached after the first call.
+        
+        Returns:
+            Set of local branch names
+        """
+        if self._local_branches is None:
+            result = self._run_git(
+                ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads"]
+            )
+            self._local_branches = set(result.stdout.split())
+        return self._local_branches
+    
+    def branch_exists(self, branch_name: str) -> bool:
+        """
+        Check whether a local branch exists, reading the ref store directly.
+        
+        Looks for a loose ref file, then searches packed-refs; only asks git
+        when both miss (e.g. reftable storage or a genuinely absent branch).
+        
+        Args:
+            branch_name: Branch name
+            
+        Returns:
+            True if the branch exists locally
+        """
+        if self._local_branches is not None:
+            return branch_name in self._local_branches
+        
+        git_dir = str(self.git_common_dir or self.repo_path / ".git")
+        if os.path.isfile(os.path.join(git_dir, "refs", "heads", branch_name)):
+            return True
+        
+        try:
+            with open(os.path.join(git_dir, "packed-refs"), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as packed:
+                    if packed.find(b" refs/heads/" + branch_name.encode() + b"\n") != -1:
+                        return True
+        except (OSError, ValueError):
+            # Missing or empty packed-refs (mmap rejects empty files)
+            pass
+        
+        return branch_name in self.get_local_branches()
+    
     def get_current_branch(self) -> str:
         """
         Get the current branch name.
@@ -105,17 +751,11 @@ class NewsPublisher:
         Returns:
             Current branch name
         """
+        if self._current_branch_cache is not None:
+            return self._current_branch_cache
+        
         try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            current_branch = result.stdout.strip()
-            return current_branch
+            return self.read_repo_status()["branch"]
             
         except subprocess.CalledProcessError as e:
             print(f"Error getting current branch: {e}")
@@ -133,38 +773,21 @@ class NewsPublisher:
         """
         try:
             # Check if branch exists locally
-            result = subprocess.run(
-                ["git", "branch", "--list", branch_name],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            branch_exists = bool(result.stdout.strip())
+            branch_exists = self.branch_exists(branch_name)
             
             if not branch_exists:
                 # Try to create branch from remote
                 print(f"Branch '{branch_name}' not found locally, trying to create from remote...")
-                result = subprocess.run(
-                    ["git", "checkout", "-b", branch_name, f"origin/{branch_name}"],
-                    cwd=self.repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
+                result = self._run_git(["git", "checkout", "-b", branch_name, f"origin/{branch_name}"])
+                if self._local_branches is not None:
+                    self._local_branches.add(branch_name)
                 print(f"Created and switched to branch '{branch_name}' from remote")
             else:
                 # Switch to existing branch
-                result = subprocess.run(
-                    ["git", "checkout", branch_name],
-                    cwd=self.repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
+                result = self._run_git(["git", "checkout", branch_name])
                 print(f"Switched to branch '{branch_name}'")
             
+            self._current_branch_cache = branch_name
             return True
             
         except subprocess.CalledProcessError as e:
@@ -203,20 +826,14 @@ class NewsPublisher:
         """
         try:
             # Check for both staged and unstaged changes
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            changes = self.read_repo_status()["changes"]
             
-            # If output is empty, no changes
-            has_changes = bool(result.stdout.strip())
+            # If there are no entries, no changes
+            has_changes = bool(changes)
             
             if has_changes:
                 print("Git status shows changes to commit:")
-                print(result.stdout)
+                print("\n".join(changes))
             else:
                 print("No changes detected in git working directory")
                 
@@ -226,21 +843,65 @@ class NewsPublisher:
             print(f"Error checking git status: {e}")
             return False
     
-    def stage_changes(self) -> bool:
+    @staticmethod
+    def write_pathspec_file(paths: List[str]) -> str:
+        """
+        Write paths to a NUL-separated file for git's --pathspec-from-file.
+        
+        Args:
+            paths: File paths, relative to the current directory or absolute
+            
+        Returns:
+            Path to the temporary pathspec file (caller removes it)
+        """
+        fd, pathspec_file = tempfile.mkstemp(prefix="git-pathspec-")
+        with os.fdopen(fd, 'wb') as f:
+            # Absolute paths, since git resolves pathspecs against the repo cwd
+            f.write(b"\0".join(os.fsencode(os.path.abspath(p)) for p in paths))
+        return pathspec_file
+    
+    def has_effective_changes(self) -> bool:
+        """
+        Cheaply check whether the worktree differs from HEAD at all.
+        
+        `git diff --quiet HEAD` stops at the first differing entry instead of
+        enumerating every change; untracked files are checked separately since
+        diff does not see them.
+        
+        Returns:
+            True if there is anything to commit (or it cannot be ruled out)
         """
-        Stage all changes for commit.
+        diff = self._run_git(["git", "diff", "--quiet", "HEAD"], check=False, text=False)
+        if diff.returncode != 0:
+            # 1 = differences; anything else (e.g. no HEAD yet) = assume changes
+            return True
+        
+        untracked = self._run_git(
+            ["git", "ls-files", "--others", "--exclude-standard", "--directory", "--no-empty-directory"],
+            check=False,
+            text=False
+        )
+        return untracked.returncode != 0 or bool(untracked.stdout.strip())
+    
+    def stage_changes(self, pathspec_file: Optional[str] = None) -> bool:
+        """
+        Stage changes for commit.
+        
+        Args:
+            pathspec_file: NUL-separated pathspec file limiting what is staged;
+                stages the whole worktree if None
         
         Returns:
             True if successful, False otherwise
         """
         try:
-            result = subprocess.run(
-                ["git", "add", "."],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            if pathspec_file:
+                self._run_git(
+                    ["git", "add", f"--pathspec-from-file={pathspec_file}", "--pathspec-file-nul"],
+                    text=False
+                )
+            else:
+                self._run_git(["git", "add", "."], text=False)
             
             print("Successfully staged all changes")
             return True
@@ -248,7 +909,7 @@ class NewsPublisher:
         except subprocess.CalledProcessError as e:
             print(f"Error staging changes: {e}")
             if e.stderr:
-                print(f"Error details: {e.stderr}")
+                print(f"Error details: {e.stderr.decode('utf-8', 'replace')}")
             return False
     
     def commit_changes(self, commit_msg: str) -> bool:
@@ -262,29 +923,74 @@ class NewsPublisher:
             True if successful, False otherwise
         """
         try:
-            result = subprocess.run(
-                ["git", "commit", "-m", commit_msg],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
+            # Exit code 0 means the index matches HEAD: nothing staged
+            staged = self._run_git(["git", "diff", "--cached", "--quiet"], check=False, text=False)
+            if staged.returncode == 0:
+                print("Nothing to commit, working tree clean")
+                return True
+            
+            # Message on stdin: no argv escaping, multi-line safe; git's summary
+            # is streamed straight through
+            self._run_streaming(
+                ["git", "commit", "--allow-empty-message", "-F", "-"],
+                input=commit_msg
             )
             
             print(f"Successfully committed changes: {commit_msg}")
-            if result.stdout:
-                print(result.stdout)
             return True
             
         except subprocess.CalledProcessError as e:
-            # If nothing to commit, this is not an error condition
-            if "nothing to commit" in e.stdout or "nothing to commit" in e.stderr:
-                print("Nothing to commit, working tree clean")
-                return True
-            
             print(f"Error committing changes: {e}")
+            return False
+    
+    def commit_all_changes(self, commit_msg: str, pathspec_file: Optional[str] = None) -> Optional[bool]:
+        """
+        Stage, check for staged changes and commit in a single shell invocation.
+        
+        Args:
+            commit_msg: Commit message
+            pathspec_file: NUL-separated pathspec file limiting what is staged;
+                stages everything if None
+            
+        Returns:
+            True if a commit was made, None if there was nothing to commit,
+            False if any step failed
+        """
+        args = ["bash", "-c", _COMMIT_ALL_SCRIPT, "publish", commit_msg, pathspec_file or ""]
+        try:
+            if self._git is not None:
+                result = self._git.run(args)
+            else:
+                # Not a git argv, so it cannot go through _run_git's -C path
+                result = subprocess.run(
+                    args, cwd=self._repo_path_str, env=self._git_env(),
+                    stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True
+                )
+        except subprocess.CalledProcessError as e:
+            step = _COMMIT_ALL_STEPS.get(e.returncode, "unknown")
+            print(f"Error in combined git {step} step: {e}")
             if e.stderr:
                 print(f"Error details: {e.stderr}")
             return False
+        
+        sections = {}
+        current = None
+        for line in result.stdout.splitlines():
+            if line.startswith("---") and line.endswith("---"):
+                current = line.strip("-")
+                sections[current] = []
+            elif current:
+                sections[current].append(line)
+        
+        if "CLEAN" in sections:
+            print("No changes detected in git working directory")
+            return None
+        
+        print("Successfully staged all changes")
+        print("\n".join(sections.get("STAGED", [])))
+        print(f"Successfully committed changes: {commit_msg}")
+        print("\n".join(sections.get("COMMIT", [])))
+        return True
     
     def pull_changes(self) -> bool:
         """
@@ -296,29 +1002,118 @@ class NewsPublisher:
         try:
             current_branch = self.get_current_branch()
             
-            result = subprocess.run(
-                ["git", "pull", "--rebase", "origin", current_branch],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
+            self._run_streaming(
+                ["git", "pull", "--rebase", *_REMOTE_QUIET_FLAGS, "origin", current_branch],
+                env=self._remote_env()
             )
             
             print(f"Successfully pulled latest changes from {current_branch}")
-            if result.stdout:
-                print(result.stdout)
             return True
             
         except subprocess.CalledProcessError as e:
             print(f"Error pulling changes: {e}")
-            if e.stderr:
-                print(f"Error details: {e.stderr}")
+            return False
+    
+    def _object_reader(self) -> _GitObjectReader:
+        """Get the shared cat-file reader for this repository."""
+        key = self._git_dir or self._repo_path_str
+        with _OBJECT_READERS_LOCK:
+            reader = _OBJECT_READERS.get(key)
+            if reader is None:
+                reader = _OBJECT_READERS[key] = _GitObjectReader(self._git_argv([]))
+            return reader
+    
+    def resolve_ref(self, rev: str) -> Optional[str]:
+        """
+        Resolve a revision to an object SHA through the persistent reader.
+        
+        Args:
+            rev: Revision, e.g. "refs/remotes/origin/gh-pages"
+            
+        Returns:
+            Object SHA, or None if it does not resolve
+        """
+        try:
+            fields = self._object_reader().query(rev).split()
+        except (OSError, RuntimeError):
+            return None
+        if len(fields) != 3:
+            return None  # "<rev> missing" / "<rev> ambiguous"
+        return fields[0].decode()
+    
+    def read_remote_head(self, branch: str) -> Optional[str]:
+        """
+        Read the locally known tip of origin/<branch>.
+        
+        Args:
+            branch: Branch name
+            
+        Returns:
+            Commit SHA, or None if there is no remote-tracking ref
+        """
+        return self.resolve_ref(f"refs/remotes/origin/{branch}")
+    
+    @staticmethod
+    def _push_args(branch: str) -> List[str]:
+        """
+        Build the push command.
+        
+        A plain push is rejected as non-fast-forward when the remote moved,
+        which push_changes answers with a rebase; no lease is needed.
+        """
+        return ["git", "push", "--porcelain", *_REMOTE_QUIET_FLAGS, "origin", branch]
+    
+    @staticmethod
+    def _push_rejections(output: str) -> List[str]:
+        """
+        Collect rejection reasons from ``git push --porcelain`` output.
+        
+        Rejected refs are the lines flagged ``!``, e.g.
+        ``!\tHEAD:refs/heads/main\t[rejected] (fetch first)``.
+        
+        Args:
+            output: Combined push output
+            
+        Returns:
+            Summary field of each rejected ref
+        """
+        return [
+            line.rpartition("\t")[2]
+            for line in output.splitlines()
+            if line.startswith("!\t")
+        ]
+    
+    def rebase_on_remote(self, branch: str) -> bool:
+        """
+        Fetch origin/<branch> once and rebase local commits onto it.
+        
+        Args:
+            branch: Branch name
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self._run_streaming(
+                ["git", "fetch", *_REMOTE_QUIET_FLAGS, "origin", branch],
+                env=self._remote_env()
+            )
+            self._run_streaming(["git", "rebase", "FETCH_HEAD"])
+            print(f"Rebased onto latest origin/{branch}")
+            return True
+            
+        except subprocess.CalledProcessError as e:
+            print(f"Error rebasing onto origin/{branch}: {e}")
+            self._run_git(["git", "rebase", "--abort"], check=False, text=False)
             return False
     
     def push_changes(self) -> bool:
         """
         Push committed changes to remote repository.
         
+        If the remote moved, local commits are rebased onto a single fetch
+        and pushed again.
+        
         Returns:
             True if successful, False otherwise
         """
@@ -330,36 +1125,22 @@ class NewsPublisher:
             # Push to the current branch (which should be target_branch)
             current_branch = self.get_current_branch()
             
-            result = subprocess.run(
-                ["git", "push", "origin", current_branch],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            # Quiet, porcelain, and unable to prompt for credentials
+            self._run_streaming(self._push_args(current_branch), env=self._remote_env())
             
             print(f"Successfully pushed changes to remote repository (branch: {current_branch})")
-            if result.stdout:
-                print(result.stdout)
-            if result.stderr:  # Git push info often goes to stderr
-                print(result.stderr)
             return True
             
         except subprocess.CalledProcessError as e:
             print(f"Error pushing changes: {e}")
-            if e.stderr:
-                print(f"Error details: {e.stderr}")
             
             # Try setting upstream if needed
             if "no upstream branch" in str(e.stderr):
                 try:
                     print(f"Setting upstream for branch {current_branch}...")
-                    result = subprocess.run(
-                        ["git", "push", "--set-upstream", "origin", current_branch],
-                        cwd=self.repo_path,
-                        capture_output=True,
-                        text=True,
-                        check=True
+                    self._run_streaming(
+                        ["git", "push", *_REMOTE_QUIET_FLAGS, "--set-upstream", "origin", current_branch],
+                        env=self._remote_env()
                     )
                     print(f"Successfully set upstream and pushed to {current_branch}")
                     return True
@@ -367,95 +1148,440 @@ class NewsPublisher:
                     print(f"Error setting upstream: {e2}")
                     return False
             
-            # Try pull and push again if rejected due to remote changes
-            if "rejected" in str(e.stderr) and ("fetch first" in str(e.stderr) or "non-fast-forward" in str(e.stderr)):
-                print("Push rejected due to remote changes. Attempting pull and retry...")
-                if self.pull_changes():
-                    # Retry push after pull
+            # Remote moved (non-fast-forward): rebase on one fetch and retry
+            rejections = self._push_rejections(e.output or "")
+            if any(
+                reason in rejection
+                for rejection in rejections
+                for reason in ("fetch first", "non-fast-forward")
+            ):
+                print("Push rejected due to remote changes. Rebasing and retrying...")
+                if self.rebase_on_remote(current_branch):
                     try:
-                        result = subprocess.run(
-                            ["git", "push", "origin", current_branch],
-                            cwd=self.repo_path,
-                            capture_output=True,
-                            text=True,
-                            check=True
-                        )
-                        print(f"Successfully pushed after pull to {current_branch}")
-                        if result.stdout:
-                            print(result.stdout)
-                        if result.stderr:
-                            print(result.stderr)
+                        self._run_streaming(self._push_args(current_branch), env=self._remote_env())
+                        print(f"Successfully pushed after rebase to {current_branch}")
                         return True
                     except subprocess.CalledProcessError as e3:
-                        print(f"Error pushing after pull: {e3}")
+                        print(f"Error pushing after rebase: {e3}")
                         return False
                 else:
-                    print("Failed to pull changes before retry")
+                    print("Failed to rebase before retry")
                     return False
             
             return False
     
+    def _run_background(self, args: List[str]) -> subprocess.CompletedProcess:
+        """
+        Run a command in the repository, draining its pipes with communicate().
+        
+        Args:
+            args: Command and arguments
+            
+        Returns:
+            Completed process with decoded stdout and stderr
+        """
+        proc = subprocess.Popen(
+            args,
+            cwd=self._repo_path_str,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        stdout, stderr = proc.communicate()
+        return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+    
+    def prepare_deploy(self) -> bool:
+        """
+        Install node dependencies if the blog repository has none installed yet.
+        
+        Returns:
+            True if successful or not needed, False otherwise
+        """
+        if not (self.repo_path / "package-lock.json").exists() or (self.repo_path / "node_modules").exists():
+            return True
+        
+        print(f"Running 'npm ci --prefer-offline' in {self.repo_path}")
+        result = self._run_background(["npm", "ci", "--prefer-offline"])
+        if result.returncode != 0:
+            print(f"❌ Error running npm ci: {result.stderr.strip()}")
+            return False
+        return True
+    
+    def _get_deploy_worker(self) -> subprocess.Popen:
+        """
+        Start the node deploy worker, or return the one already running.
+        
+        Returns:
+            Worker process speaking JSON lines over stdin/stdout
+        """
+        global _DEPLOY_WORKER
+        if _DEPLOY_WORKER is None or _DEPLOY_WORKER.poll() is not None:
+            print(f"Starting deploy worker: node {self.deploy_worker}")
+            _DEPLOY_WORKER = subprocess.Popen(
+                ["node", self.deploy_worker],
+                cwd=self._repo_path_str,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1
+            )
+        return _DEPLOY_WORKER
+    
+    def run_deploy_worker(self) -> bool:
+        """
+        Ask the warm node worker to build and deploy.
+        
+        Returns:
+            True if the worker reported success, False otherwise
+        """
+        global _DEPLOY_WORKER
+        with _DEPLOY_WORKER_LOCK:
+            try:
+                worker = self._get_deploy_worker()
+                for cmd in ("build", "deploy"):
+                    worker.stdin.write(json.dumps({"cmd": cmd}) + "\n")
+                    worker.stdin.flush()
+                    reply = worker.stdout.readline()
+                    if not reply:
+                        raise RuntimeError("deploy worker exited")
+                    response = json.loads(reply)
+                    if response.get("status") != "ok":
+                        print(f"❌ Deploy worker failed on '{cmd}': {response}")
+                        return False
+                
+                print("✅ Successfully deployed via deploy worker")
+                return True
+                
+            except (OSError, ValueError, RuntimeError) as e:
+                print(f"❌ Deploy worker error: {e}")
+                if _DEPLOY_WORKER is not None:
+                    _DEPLOY_WORKER.kill()
+                    _DEPLOY_WORKER = None
+                return False
+    
     def run_deploy_command(self) -> bool:
         """
         Execute npm run deploy in the blog repository.
         
+        Uses the warm deploy worker instead when one is configured, falling
+        back to npm if it fails.
+        
         Returns:
             True if successful, False otherwise
         """
+        if self.deploy_worker:
+            if self.run_deploy_worker():
+                return True
+            print("⚠️  Falling back to npm run deploy")
+        
         try:
             print(f"Running 'npm run deploy' in {self.repo_path}")
-            result = subprocess.run(
-                ["npm", "run", "deploy"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            self._run_streaming(["npm", "run", "deploy"])
             
             print("✅ Successfully executed npm run deploy")
-            if result.stdout:
-                print(result.stdout)
-            if result.stderr:
-                print(result.stderr)
             return True
             
         except subprocess.CalledProcessError as e:
             print(f"❌ Error running npm run deploy: {e}")
-            if e.stderr:
-                print(f"Error details: {e.stderr}")
             return False
     
-    def publish(self, commit_msg: str, auto_push: bool = True) -> bool:
+    def _read_watermark_state(self) -> Dict:
+        """Read the watermark file, or an empty state if there is none."""
+        try:
+            with open(self.watermark_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+    
+    def read_watermark(self) -> Optional[int]:
+        """
+        Read the mtime watermark of the last successful full-tree publish.
+        
+        Returns:
+            Watermark in nanoseconds, or None if there is none yet
+        """
+        try:
+            return int(self._read_watermark_state()["last_publish_mtime_ns"])
+        except (KeyError, ValueError, TypeError):
+            return None
+    
+    def write_watermark(self, mtime_ns: Optional[int] = None,
+                        path_digests: Optional[Dict[str, str]] = None):
+        """
+        Record a successful publish.
+        
+        Args:
+            mtime_ns: Time a full-tree publish started, in nanoseconds
+            path_digests: Content digests of the paths a paths-only publish
+                committed; merged into the ones already recorded
+        """
+        state = self._read_watermark_state()
+        if mtime_ns is not None:
+            state["last_publish_mtime_ns"] = mtime_ns
+        if path_digests:
+            recorded = state.get("paths")
+            state["paths"] = {**(recorded if isinstance(recorded, dict) else {}), **path_digests}
+        try:
+            with open(self.watermark_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+        except OSError as e:
+            print(f"Warning: could not write publish watermark: {e}")
+    
+    @staticmethod
+    def path_digests(paths: List[str]) -> Optional[Dict[str, str]]:
+        """
+        Hash the current content of each path.
+        
+        Args:
+            paths: Files written by the pipeline
+            
+        Returns:
+            SHA-256 hex digest per absolute path, or None if any path is unreadable
+        """
+        digests = {}
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    digests[os.path.abspath(path)] = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                return None
+        return digests
+    
+    def paths_unchanged(self, digests: Optional[Dict[str, str]]) -> bool:
+        """
+        Check whether every path still has the content of its last publish.
+        
+        Content rather than mtime is compared, since the pipeline rewrites its
+        output files on every run even when nothing in them changed.
+        
+        Args:
+            digests: Current digests from path_digests()
+            
+        Returns:
+            True only when every path was published before with this content
+        """
+        if not digests:
+            return False
+        recorded = self._read_watermark_state().get("paths")
+        if not isinstance(recorded, dict):
+            return False
+        return all(recorded.get(path) == digest for path, digest in digests.items())
+    
+    @staticmethod
+    def _modified_since(path: str, watermark: int) -> bool:
+        """Return True on the first entry under path modified after watermark."""
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # Directory mtimes also move when files are added or removed
+                if entry.stat(follow_symlinks=False).st_mtime_ns > watermark:
+                    return True
+                if entry.is_dir(follow_symlinks=False) and NewsPublisher._modified_since(entry.path, watermark):
+                    return True
+        return False
+    
+    def content_unchanged(self) -> bool:
+        """
+        Check whether the blog content is untouched since the last publish.
+        
+        Returns:
+            True only when a watermark exists and no content file is newer
+        """
+        watermark = self.read_watermark()
+        if watermark is None:
+            return False
+        
+        content_dir = self.get_blog_directory()
+        repo_root = Path(self._repo_path_str)
+        # Only trust the shortcut when the content lives in the repository we publish
+        if repo_root != content_dir and repo_root not in content_dir.parents:
+            return False
+        
+        try:
+            if os.stat(content_dir).st_mtime_ns > watermark:
+                return False
+            return not self._modified_since(str(content_dir), watermark)
+        except OSError:
+            return False
+    
+    def publish(self, commit_msg: str, auto_push: bool = True, paths: Optional[List[str]] = None) -> bool:
         """
         Execute the complete publish workflow: stage, commit, and deploy.
         
         Args:
             commit_msg: Commit message
             auto_push: Whether to automatically deploy (default: True)
+            paths: Files written by the pipeline; only these are staged when
+                given, otherwise the whole worktree is
+            
+        Returns:
+            True if all operations successful, False otherwise
+        """
+        return self.publish_batch([(commit_msg, paths)], auto_push=auto_push)
+    
+    def stage_only(self, commit_msg: str, paths: Optional[List[str]] = None) -> bool:
+        """
+        Stage an update and queue it for the next flush() instead of publishing.
+        
+        Args:
+            commit_msg: Commit message for this update
+            paths: Files written by the pipeline; the whole worktree if None
+            
+        Returns:
+            True if the changes were staged, False otherwise
+        """
+        pathspec_file = self.write_pathspec_file(paths) if paths else None
+        try:
+            with self._pending_lock:
+                if not self.stage_changes(pathspec_file):
+                    return False
+                self._pending.append((commit_msg, paths))
+                if self._pending_since is None:
+                    self._pending_since = time.monotonic()
+        finally:
+            if pathspec_file:
+                os.remove(pathspec_file)
+        
+        print(f"📦 Queued update for batched publish ({len(self._pending)} pending)")
+        return True
+    
+    def has_pending(self) -> bool:
+        """Whether stage_only() queued updates that are not yet published."""
+        return bool(self._pending)
+    
+    def pending_due_in(self, window: float) -> float:
+        """
+        Seconds until the oldest queued update has waited `window` seconds.
+        
+        Args:
+            window: Batching window in seconds
+            
+        Returns:
+            Remaining seconds, 0 if the queue is due now or empty
+        """
+        if self._pending_since is None:
+            return 0.0
+        return max(0.0, window - (time.monotonic() - self._pending_since))
+    
+    def flush(self, auto_push: bool = True) -> bool:
+        """
+        Publish every queued update as one commit and one deploy.
+        
+        Updates stay queued if publishing fails, so the next flush retries them.
+        
+        Args:
+            auto_push: Whether to automatically deploy (default: True)
+            
+        Returns:
+            True if all operations successful (or nothing was queued), False otherwise
+        """
+        with self._pending_lock:
+            if not self._pending:
+                return True
+            
+            success = self.publish_batch(list(self._pending), auto_push=auto_push)
+            if success:
+                self._pending.clear()
+                self._pending_since = None
+            return success
+    
+    def publish_batch(self, entries: List[Tuple[str, Optional[List[str]]]], auto_push: bool = True) -> bool:
+        """
+        Publish several updates as one commit and one deploy.
+        
+        Args:
+            entries: (commit message, written paths or None) per update; a None
+                path list stages the whole worktree
+            auto_push: Whether to automatically deploy (default: True)
             
         Returns:
             True if all operations successful, False otherwise
         """
+        if not entries:
+            print("✅ Nothing to publish")
+            return True
+        
+        if len(entries) == 1:
+            commit_msg = entries[0][0]
+        else:
+            # Summary line, then each entry's message on its own line
+            commit_msg = f"Publish {len(entries)} news updates\n\n" + "\n".join(msg for msg, _ in entries)
+        
+        # Any entry without known paths means everything must be staged
+        if all(entry_paths for _, entry_paths in entries):
+            paths = [path for _, entry_paths in entries for path in entry_paths]
+        else:
+            paths = None
+        
         print(f"Starting publish workflow in: {self.repo_path}")
         print(f"Commit message: {commit_msg}")
         
-        # Check if there are changes to commit
-        if not self.check_git_status():
-            print("✅ No changes to publish, exiting successfully")
+        # Nothing changed since the last successful publish: skip git entirely.
+        # A paths-only publish compares just those files' content; a full one
+        # looks for anything in the content tree newer than the watermark
+        digests = self.path_digests(paths) if paths else None
+        if self.paths_unchanged(digests) if paths else self.content_unchanged():
+            print("✅ No content changes since last publish, exiting successfully")
             return True
         
-        # Stage changes
-        if not self.stage_changes():
-            print("❌ Failed to stage changes")
-            return False
+        started_ns = time.time_ns()
+        # Read the branch afresh once per publish
+        self._current_branch_cache = None
         
-        # Commit changes
-        if not self.commit_changes(commit_msg):
-            print("❌ Failed to commit changes")
-            return False
+        pathspec_file = self.write_pathspec_file(paths) if paths else None
+        
+        # Run every git step of this publish through one persistent shell
+        try:
+            with _GitSession(self._repo_path_str, env=self._git_env()) as session:
+                self._git = session
+                try:
+                    success = self._publish(commit_msg, auto_push, pathspec_file)
+                finally:
+                    self._git = None
+        finally:
+            if pathspec_file:
+                os.remove(pathspec_file)
+        
+        # Only a publish that staged everything advances the mtime watermark;
+        # after a paths-only one, edits elsewhere would wrongly look published,
+        # so it records just the content of the paths it committed
+        if success:
+            if paths is None:
+                self.write_watermark(mtime_ns=started_ns)
+            elif digests:
+                self.write_watermark(path_digests=digests)
+        return success
+    
+    def _publish(self, commit_msg: str, auto_push: bool, pathspec_file: Optional[str]) -> bool:
+        """Publish workflow body; runs with the git session open."""
+        # Stage, no-change check and commit in one shell invocation
+        committed = self.commit_all_changes(commit_msg, pathspec_file)
+        if committed is None:
+            print("✅ No changes to publish, exiting successfully")
+            return True
+        
+        if not committed:
+            # Fall back to the step-by-step path for per-step diagnostics
+            print("⚠️  Combined commit failed, retrying step by step")
+            if not self.check_git_status():
+                print("✅ No changes to publish, exiting successfully")
+                return True
+            
+            if not self.stage_changes(pathspec_file):
+                print("❌ Failed to stage changes")
+                return False
+            
+            if not self.commit_changes(commit_msg):
+                print("❌ Failed to commit changes")
+                return False
         
         # Run npm deploy if requested
         if auto_push:
+            if not self.prepare_deploy():
+                print("❌ Failed to prepare deploy")
+                return False
+            
             if not self.run_deploy_command():
                 print("❌ Failed to deploy changes")
                 return False
@@ -7,19 +7,53 @@ import os
 import sys
 import signal
 import time
-import json
 import logging
+import logging.handlers
+import queue
 import argparse
+import asyncio
 import atexit
-from datetime import datetime
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional, Set, Tuple
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 
+from ._config import load_config
 from .job import NewsJob
+from .publisher import NewsPublisher
+
+
+# Background thread that writes queued log records to file and stdout
+_LOG_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+# (cron expression, timezone) -> parsed trigger, reused across restarts
+_TRIGGER_CACHE: Dict[Tuple[str, str], CronTrigger] = {}
+
+
+def get_cron_trigger(cron_expr: str, timezone: str) -> CronTrigger:
+    """
+    Parse a standard 5-field crontab expression, once per (expression, timezone).
+    
+    Args:
+        cron_expr: Crontab expression, e.g. "0 8 * * *"
+        timezone: Timezone name for the trigger
+        
+    Returns:
+        Cached CronTrigger
+        
+    Raises:
+        ValueError: If the expression is not a valid 5-field crontab
+    """
+    key = (cron_expr, timezone)
+    trigger = _TRIGGER_CACHE.get(key)
+    if trigger is None:
+        trigger = _TRIGGER_CACHE[key] = CronTrigger.from_crontab(cron_expr, timezone=timezone)
+    return trigger
 
 
 class NewsScheduler:
@@ -34,7 +68,18 @@ class NewsScheduler:
         self.config = self.load_config()
         self.scheduler = None
         self.pid_file = "news_scheduler.pid"
+        # (pid, mtime_ns) of the last PID file read
+        self._pid_cache: Optional[Tuple[int, int]] = None
         self.running = False
+        # shutdown() does its work once, whichever path reaches it first
+        self._shutdown_lock = threading.Lock()
+        self._shutdown_done = False
+        # Kept across ticks so updates can be batched into one publish
+        self._publisher: Optional[NewsPublisher] = None
+        # Pipeline runs happen here so a long run never holds up the scheduler
+        self._job_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="news-job")
+        self._job_futures: Set[Future] = set()
+        self._job_futures_lock = threading.Lock()
         
         # Setup logging
         self.setup_logging()
@@ -43,16 +88,13 @@ class NewsScheduler:
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
-        # Note: atexit.register will be set only when scheduler is actually started
         
         self.logger.info("News Scheduler initialized")
     
-    def load_config(self) -> Dict:
+    def load_config(self) -> Mapping:
         """Load configuration from JSON file."""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            return config
+            return load_config(self.config_file)
         except FileNotFoundError:
             print(f"Warning: Config file {self.config_file} not found, using defaults")
             return self.get_default_config()
@@ -66,7 +108,9 @@ class NewsScheduler:
                 "cron_expression": "0 8 * * *",  # Every day at 08:00
                 "dry_run": False,
                 "max_retries": 3,
-                "retry_interval_minutes": 30
+                "retry_interval_minutes": 30,
+                # Coalesce updates staged within this many seconds into one publish
+                "publish_batch_window_seconds": 0
             },
             "logging_config": {
                 "level": "INFO",
@@ -78,7 +122,16 @@ class NewsScheduler:
         }
     
     def setup_logging(self):
-        """Setup logging configuration."""
+        """
+        Setup logging configuration.
+        
+        Loggers only enqueue records; a QueueListener thread does the file and
+        console I/O, so logging never blocks the job or a signal handler.
+        """
+        global _LOG_LISTENER
+        if _LOG_LISTENER is not None:
+            return
+        
         log_config = self.config.get("logging_config", {})
         
         # Create logs directory
@@ -89,20 +142,38 @@ class NewsScheduler:
         log_level = getattr(logging, log_config.get("level", "INFO"))
         log_file = Path(log_dir) / log_config.get("log_file", "scheduler.log")
         
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=log_config.get("max_bytes", 10485760),
+            backupCount=log_config.get("backup_count", 5),
+            encoding='utf-8'
         )
+        stream_handler = logging.StreamHandler(sys.stdout)
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        # QueueHandler renders the message once; the real handlers add the prefix
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        logging.basicConfig(level=log_level, handlers=[queue_handler])
+        
+        _LOG_LISTENER = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler, respect_handler_level=True
+        )
+        _LOG_LISTENER.start()
+        atexit.register(_LOG_LISTENER.stop)
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
         signal_name = signal.Signals(signum).name
         self.logger.info(f"Received {signal_name} signal, initiating graceful shutdown...")
-        self.shutdown()
+        if self.scheduler and self.scheduler.running:
+            # Return control from the blocking start(); cleanup runs there
+            self.scheduler.shutdown(wait=False)
+        else:
+            self.shutdown()
     
     def create_pid_file(self):
         """Create PID file for process management."""
@@ -120,25 +191,66 @@ class NewsScheduler:
         except Exception as e:
             self.logger.error(f"Error removing PID file: {e}")
     
-    def is_running(self) -> bool:
-        """Check if scheduler is already running by checking PID file."""
-        if not os.path.exists(self.pid_file):
-            return False
+    def _read_pid(self) -> Optional[int]:
+        """
+        Read the PID file, reusing the last parse while its mtime is unchanged.
         
+        Returns:
+            PID, or None if there is no PID file
+            
+        Raises:
+            ValueError: If the PID file is corrupted
+        """
         try:
             with open(self.pid_file, 'r') as f:
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                if self._pid_cache and self._pid_cache[1] == mtime_ns:
+                    return self._pid_cache[0]
                 pid = int(f.read().strip())
+        except FileNotFoundError:
+            self._pid_cache = None
+            return None
+        
+        self._pid_cache = (pid, mtime_ns)
+        return pid
+    
+    def is_running(self) -> bool:
+        """Check if scheduler is already running by checking PID file."""
+        try:
+            pid = self._read_pid()
+            if pid is None:
+                return False
             
             # Check if process is still running
             os.kill(pid, 0)  # This will raise OSError if process doesn't exist
             return True
-        except (OSError, ValueError, FileNotFoundError):
+        except (OSError, ValueError):
             # Process is not running or PID file is corrupted
             self.remove_pid_file()
             return False
     
     def execute_news_job(self):
-        """Execute the news processing job."""
+        """
+        Submit the news processing job to the job pool and return immediately.
+        
+        A tick that arrives while the previous run is still going is skipped
+        with a warning, so runs never overlap.
+        """
+        with self._job_futures_lock:
+            if any(not future.done() for future in self._job_futures):
+                self.logger.warning("Previous news job is still running, skipping this tick")
+                return
+            future = self._job_pool.submit(self._run_news_job_impl)
+            self._job_futures.add(future)
+        future.add_done_callback(self._discard_job_future)
+    
+    def _discard_job_future(self, future: Future):
+        """Forget a finished job future."""
+        with self._job_futures_lock:
+            self._job_futures.discard(future)
+    
+    def _run_news_job_impl(self):
+        """Run the news processing job on the calling thread."""
         try:
             self.logger.info("Starting scheduled news processing job...")
             start_time = time.time()
@@ -149,9 +261,14 @@ class NewsScheduler:
             # Get current date
             current_date = datetime.now().strftime("%Y-%m-%d")
             
-            # Execute the job
-            job = NewsJob(current_date, dry_run=dry_run)
+            self.log_repo_state()
+            
+            # Execute the job; its update is staged and published by flush_publishes()
+            job = NewsJob(current_date, dry_run=dry_run,
+                          publisher=None if dry_run else self.get_publisher())
             success = job.run_pipeline()
+            if not dry_run:
+                self.flush_publishes()
             
             duration = time.time() - start_time
             
@@ -163,6 +280,59 @@ class NewsScheduler:
         except Exception as e:
             self.logger.error(f"Error executing news job: {e}", exc_info=True)
     
+    def get_publisher(self) -> NewsPublisher:
+        """Get the publisher shared by every job of this scheduler."""
+        if self._publisher is None:
+            self._publisher = NewsPublisher(config_file=self.config_file)
+        return self._publisher
+    
+    def flush_publishes(self, force: bool = False):
+        """
+        Publish queued updates once the batching window has passed.
+        
+        While the window is open and the scheduler is running, a one-off job
+        is (re)scheduled for when it closes; later ticks inside the window add
+        to the same commit and push.
+        
+        Args:
+            force: Publish now regardless of the window
+        """
+        publisher = self._publisher
+        if publisher is None or not publisher.has_pending():
+            return
+        
+        window = self.config.get("scheduler_config", {}).get("publish_batch_window_seconds", 0)
+        remaining = 0 if force else publisher.pending_due_in(window)
+        if remaining > 0 and self.scheduler and self.scheduler.running:
+            run_date = datetime.now(self.scheduler.timezone) + timedelta(seconds=remaining)
+            self.scheduler.add_job(
+                func=self.flush_publishes,
+                trigger='date',
+                run_date=run_date,
+                kwargs={'force': True},
+                id='publish_flush',
+                name='Batched Publish',
+                replace_existing=True
+            )
+            self.logger.info(f"Publish deferred to {run_date} to batch further updates")
+            return
+        
+        if publisher.flush():
+            self.logger.info("Published queued updates")
+        else:
+            self.logger.error("Publishing queued updates failed; they stay queued for the next flush")
+    
+    def log_repo_state(self):
+        """Log the blog repository's branch, HEAD and pending changes."""
+        try:
+            state = asyncio.run(self.get_publisher().gather_status())
+            self.logger.info(
+                f"Blog repo on {state['branch']} @ {(state['head'] or 'no commits')[:12]}, "
+                f"{len(state['changes'])} pending change(s)"
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not read blog repository state: {e}")
+    
     def job_listener(self, event):
         """Listen to job execution events."""
         if event.exception:
@@ -182,75 +352,55 @@ class NewsScheduler:
             self.logger.info("Scheduler is disabled in configuration")
             return False
         
-        # Create PID file and register cleanup
+        # Create PID file; removed by shutdown() when start() returns
         self.create_pid_file()
-        atexit.register(self.shutdown)  # Only register when actually starting
         
         try:
             # Initialize scheduler
             timezone = scheduler_config.get("timezone", "Asia/Shanghai")
-            self.scheduler = BackgroundScheduler(timezone=timezone)
+            self.scheduler = BlockingScheduler(timezone=timezone)
             
             # Add job listener
             self.scheduler.add_listener(self.job_listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
             
             # Parse cron expression and add job
             cron_expr = scheduler_config.get("cron_expression", "0 8 * * *")
-            cron_parts = cron_expr.split()
+            try:
+                trigger = get_cron_trigger(cron_expr, timezone)
+            except ValueError as e:
+                self.logger.error(f"Invalid cron expression: {cron_expr} ({e})")
+                self.remove_pid_file()
+                return False
             
-            if len(cron_parts) == 5:
-                minute, hour, day, month, day_of_week = cron_parts
-                
-                self.scheduler.add_job(
-                    func=self.execute_news_job,
-                    trigger=CronTrigger(
-                        minute=minute,
-                        hour=hour,
-                        day=day,
-                        month=month,
-                        day_of_week=day_of_week,
-                        timezone=timezone
-                    ),
-                    id='news_processing_job',
-                    name='Daily News Processing',
-                    max_instances=1,
-                    replace_existing=True
-                )
-                
-                self.logger.info(f"Scheduled job with cron expression: {cron_expr}")
-                self.logger.info(f"Timezone: {timezone}")
-                self.logger.info(f"Dry run mode: {scheduler_config.get('dry_run', False)}")
-                
-                # Start the scheduler (non-blocking)
+            self.scheduler.add_job(
+                func=self.execute_news_job,
+                trigger=trigger,
+                id='news_processing_job',
+                name='Daily News Processing',
+                max_instances=1,
+                replace_existing=True
+            )
+            
+            self.logger.info(f"Scheduled job with cron expression: {cron_expr}")
+            self.logger.info(f"Timezone: {timezone}")
+            self.logger.info(f"Dry run mode: {scheduler_config.get('dry_run', False)}")
+            
+            # The job is not scheduled until start(); ask its trigger directly
+            next_run = trigger.get_next_fire_time(None, datetime.now(trigger.timezone))
+            self.logger.info(f"Next execution scheduled for: {next_run}")
+            
+            print(f"✅ Scheduler started in daemon mode")
+            print(f"📅 Next execution: {next_run or 'TBD'}")
+            print(f"📋 Use 'python -m news_bot.scheduler stop' to stop the scheduler")
+            
+            # Runs the scheduling loop on this thread and blocks until shutdown
+            self.running = True
+            self.logger.info("News Scheduler started successfully (daemon mode)")
+            # SIGINT/SIGTERM stop the loop via _signal_handler
+            try:
                 self.scheduler.start()
-                self.running = True
-                self.logger.info("News Scheduler started successfully (daemon mode)")
-                
-                # Print next execution times after scheduler starts
-                jobs = self.scheduler.get_jobs()
-                if jobs:
-                    try:
-                        next_run = jobs[0].next_run_time
-                        self.logger.info(f"Next execution scheduled for: {next_run}")
-                    except AttributeError:
-                        self.logger.info("Scheduler started, next execution time will be determined automatically")
-                
-                # Keep the process alive in daemon mode
-                print(f"✅ Scheduler started in daemon mode")
-                print(f"📅 Next execution: {jobs[0].next_run_time if jobs else 'TBD'}")
-                print(f"📋 Use 'python -m news_bot.scheduler stop' to stop the scheduler")
-                
-                # Keep process alive
-                try:
-                    while self.running:
-                        time.sleep(1)
-                except KeyboardInterrupt:
-                    self.logger.info("Received keyboard interrupt, shutting down...")
-                    self.shutdown()
-                
-            else:
-                self.logger.error(f"Invalid cron expression: {cron_expr}")
-                return False
+            finally:
+                self.shutdown()
                 
         except Exception as e:
             self.logger.error(f"Error starting scheduler: {e}", exc_info=True)
@@ -260,17 +410,34 @@ class NewsScheduler:
         return True
     
     def shutdown(self):
-        """Shutdown the scheduler gracefully."""
+        """Shutdown the scheduler gracefully. Safe to call more than once."""
+        # Non-blocking: a signal handler re-entering while the flag is being
+        # set (same thread) must not deadlock; whoever holds it is shutting down
+        if not self._shutdown_lock.acquire(blocking=False):
+            return
+        try:
+            if self._shutdown_done:
+                return
+            self._shutdown_done = True
+        finally:
+            self._shutdown_lock.release()
+        
         if self.running:
             self.logger.info("Shutting down scheduler...")
             self.running = False
             
-            if self.scheduler:
+            if self.scheduler and self.scheduler.running:
                 try:
                     self.scheduler.shutdown(wait=True)
                     self.logger.info("Scheduler stopped successfully")
                 except Exception as e:
                     self.logger.error(f"Error stopping scheduler: {e}")
+            
+            # Let a pipeline run that is already underway finish
+            self._job_pool.shutdown(wait=True, cancel_futures=False)
+            
+            # Don't leave updates behind that were waiting for their batching window
+            self.flush_publishes(force=True)
         
         self.remove_pid_file()
         self.logger.info("News Scheduler shutdown complete")
@@ -282,18 +449,24 @@ class NewsScheduler:
             return False
         
         try:
-            with open(self.pid_file, 'r') as f:
-                pid = int(f.read().strip())
+            pid = self._read_pid()
             
             print(f"Stopping scheduler process (PID: {pid})...")
             os.kill(pid, signal.SIGTERM)
             
-            # Wait for process to shutdown
-            for _ in range(10):  # Wait up to 10 seconds
-                if not self.is_running():
+            # Wait for process to shutdown: probe with exponential backoff
+            # (1 ms, 2 ms, 4 ms, ... capped at 1 s) for up to 10 seconds
+            deadline = time.monotonic() + 10
+            delay = 0.001
+            while time.monotonic() < deadline:
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    self.remove_pid_file()
                     print("Scheduler stopped successfully")
                     return True
-                time.sleep(1)
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
             
             # Force kill if still running
             print("Force stopping scheduler...")
@@ -308,9 +481,7 @@ class NewsScheduler:
     def status(self):
         """Check scheduler status."""
         if self.is_running():
-            with open(self.pid_file, 'r') as f:
-                pid = int(f.read().strip())
-            print(f"Scheduler is running (PID: {pid})")
+            print(f"Scheduler is running (PID: {self._read_pid()})")
             return True
         else:
             print("Scheduler is not running")
@@ -321,7 +492,7 @@ class NewsScheduler:
         print("Executing news processing job immediately...")
         self.setup_logging()
         self.logger = logging.getLogger(__name__)
-        self.execute_news_job()
+        self._run_news_job_impl()
 
 
 def main():
@@ -0,0 +1,145 @@
+"""
+Persistent embedding-similarity cache for LLM summaries.
+Paraphrased copies of a story (same news from different outlets) embed close
+together, so a new article whose embedding is near enough to a summarized one
+reuses that summary instead of calling the chat model.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import orjson
+
+try:
+    import faiss
+except ImportError:  # Fall back to a numpy matrix product
+    faiss = None
+
+from .llm_cache import DEFAULT_TTL_SECONDS
+
+SEMANTIC_CACHE_FILE = '_semantic_cache.sqlite'
+EMBEDDING_MODEL = 'text-embedding-3-small'
+# Cosine similarity above which two articles are treated as the same story
+SIMILARITY_THRESHOLD = 0.92
+
+
+class SemanticCache:
+    def __init__(self, cache_file: str = SEMANTIC_CACHE_FILE, scope: str = "",
+                 threshold: float = SIMILARITY_THRESHOLD, ttl: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache; entries are loaded on first use.
+        
+        Args:
+            cache_file: SQLite file holding embeddings and their summaries
+            scope: Entries are only matched against others stored with the same
+                scope (e.g. model and prompt version)
+            threshold: Minimum cosine similarity for a hit
+            ttl: Lifetime of an entry in seconds
+        """
+        self.cache_file = cache_file
+        self.scope = scope
+        self.threshold = threshold
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._values: List[Dict] = []
+        self._index = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database and load the live entries of this scope."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.cache_file, check_same_thread=False)
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries "
+                    "(scope TEXT NOT NULL, vec BLOB NOT NULL, value BLOB NOT NULL, expires REAL NOT NULL)"
+                )
+                conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+            rows = conn.execute("SELECT vec, value FROM entries WHERE scope = ?", (self.scope,)).fetchall()
+            self._conn = conn
+            if rows:
+                vectors = np.stack([np.frombuffer(vec, dtype=np.float16) for vec, _ in rows])
+                self._add_to_index(vectors.astype(np.float32))
+                self._values = [orjson.loads(value) for _, value in rows]
+        return self._conn
+    
+    def _add_to_index(self, vectors: np.ndarray):
+        """Append unit-length float32 vectors to the in-memory index."""
+        if faiss is not None:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(vectors.shape[1])
+            self._index.add(vectors)
+        elif self._index is None:
+            self._index = vectors
+        else:
+            self._index = np.vstack([self._index, vectors])
+    
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Return the embedding as a contiguous unit-length float32 row."""
+        vec = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        return np.ascontiguousarray(vec / np.linalg.norm(vec))
+    
+    def get(self, vector: List[float]) -> Optional[Dict]:
+        """
+        Find the value stored for the most similar embedding.
+        
+        Args:
+            vector: Embedding of the article being looked up
+        
+        Returns:
+            The stored value, or None if nothing is similar enough
+        """
+        vec = self._normalize(vector)
+        with self._lock:
+            self._connect()
+            best, similarity = -1, -1.0
+            if self._values:
+                if faiss is not None:
+                    scores, ids = self._index.search(vec, 1)
+                    best, similarity = int(ids[0][0]), float(scores[0][0])
+                else:
+                    scores = self._index @ vec[0]
+                    best = int(np.argmax(scores))
+                    similarity = float(scores[best])
+            value = self._values[best] if similarity > self.threshold else None
+        
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+    
+    def set(self, vector: List[float], value: Dict):
+        """
+        Store a value under an embedding.
+        
+        Args:
+            vector: Embedding of the summarized article
+            value: JSON-serializable response data
+        """
+        vec = self._normalize(vector)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                    (self.scope, vec[0].astype(np.float16).tobytes(), orjson.dumps(value),
+                     time.time() + self.ttl)
+                )
+            self._add_to_index(vec)
+            self._values.append(value)
+    
+    def close(self):
+        """Close the database connection and drop the in-memory index."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._values = []
+            self._index = None
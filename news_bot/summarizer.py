@@ -1,38 +1,257 @@
 """
-LLM-powered news summarization using OpenAI GPT-4o.
+LLM-powered news summarization using OpenAI gpt-4o-mini, escalating to gpt-4o.
 Generates Chinese summaries and bullet point tags for news articles.
 """
 
-import json
+import asyncio
 import sys
 import os
+import re
+import tempfile
 import time
-from typing import List, Dict, Optional
-from openai import OpenAI
+from typing import List, Dict, Optional, Tuple, Union
+import httpx
+import orjson
+from openai import AsyncOpenAI, OpenAI, APIConnectionError, RateLimitError
 from dotenv import load_dotenv
 
+try:
+    import h2  # noqa: F401  (lets httpx negotiate HTTP/2)
+except ImportError:  # Fall back to HTTP/1.1 keep-alive connections
+    h2 = None
+
+from ._articles import dump_articles, load_articles
+from ._cli import parse_date_or_exit
+from ._config import load_config
+from .llm_cache import LLMCache, LLM_CACHE_FILE
+from .semantic_cache import SemanticCache, SEMANTIC_CACHE_FILE, EMBEDDING_MODEL
+
 # Load environment variables
 load_dotenv()
 
+# Default model; replies it gets wrong are retried once on ESCALATION_MODEL
+DEFAULT_MODEL = "gpt-4o-mini"
+ESCALATION_MODEL = "gpt-4o"
+# Tags the parser falls back to when a reply has none
+DEFAULT_BULLETS = ["科技", "新闻"]
+# Shorter summaries than this are treated as a failed reply
+MIN_SUMMARY_LENGTH = 20
+
+SYSTEM_PROMPT = "你是一个专业的科技新闻编辑，擅长将英文科技新闻总结成简洁明了的中文摘要。"
+# Per-article fields are filled in with str.format
+SUMMARY_PROMPT_TEMPLATE = """请为以下科技新闻撰写中文摘要和标签：
+
+标题：{title}
+描述：{description}
+来源：{source}
+链接：{url}
+
+请按照以下格式回复：
+
+摘要：[用2-3句话总结这条新闻的核心内容，使用简洁明了的中文]
+
+标签：[提供3-5个相关的中文标签，用逗号分隔，例如：人工智能,苹果,新产品发布,移动技术]
+
+要求：
+1. 摘要要准确传达新闻的关键信息和影响
+2. 使用通俗易懂的中文表达
+3. 标签应该涵盖技术领域、公司名称、产品类型等关键词
+4. 保持客观中性的语调"""
+BATCH_PROMPT_TEMPLATE = """请为以下科技新闻逐条撰写中文摘要和标签，新闻以 JSON 数组给出：
+
+{items}
+
+请只回复一个 JSON 对象，格式如下：
+{{"articles": [{{"id": 新闻的id, "summary": "摘要", "bullets": ["标签1", "标签2", "标签3"]}}]}}
+
+要求：
+1. 摘要用2-3句话总结新闻的核心内容，准确传达关键信息和影响，使用通俗易懂的中文
+2. 每条新闻提供3-5个相关的中文标签，涵盖技术领域、公司名称、产品类型等关键词
+3. 每条新闻都要有一项结果，id 与输入一致
+4. 保持客观中性的语调"""
+# Part of every cache key: bump when the prompts or response parsing change
+PROMPT_VERSION = "v2"
+# Articles summarized per request in batch mode
+BATCH_SIZE = 10
+# Requests in flight at once; the semaphore replaces the old fixed delay
+MAX_CONCURRENT_REQUESTS = 8
+# Connection pool shared by all requests of a run
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+# Errors worth retrying with backoff (APIConnectionError includes timeouts);
+# anything else fails the same way again, so it goes straight to the fallback
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError)
+# The reply format the prompt asks for: one summary line, then one tags line
+_RESPONSE_RE = re.compile(r'\s*摘要：[ \t]*(?P<summary>[^\n]*\S)[ \t]*\n\s*标签：[ \t]*(?P<tags>[^\n]*\S)\s*')
+_TAG_SEPARATOR_RE = re.compile(r'\s*[，,]\s*')
+# Batch API jobs finish within 24h at half the price; poll this often
+BATCH_API_POLL_SECONDS = 60
+BATCH_API_DONE_STATUSES = {"completed", "failed", "expired", "cancelled"}
+# Token budget reserved per article before a request (prompt plus max_tokens);
+# the account's limits come from the OPENAI_RPM / OPENAI_TPM env vars
+TOKENS_PER_REQUEST_ESTIMATE = 500
+
+
+class TokenBucket:
+    def __init__(self, rate_rpm: Optional[float] = None, rate_tpm: Optional[float] = None):
+        """
+        Client-side limiter for requests and tokens per minute.
+        
+        Each bucket holds up to one minute's allowance and refills continuously,
+        so bursts up to the limit go out at once and only the excess waits.
+        
+        Args:
+            rate_rpm: Requests per minute (None for no request limit)
+            rate_tpm: Tokens per minute (None for no token limit)
+        """
+        self.rate_rpm = rate_rpm
+        self.rate_tpm = rate_tpm
+        self._requests = rate_rpm or 0.0
+        self._tokens = rate_tpm or 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    @classmethod
+    def from_env(cls) -> Optional["TokenBucket"]:
+        """
+        Limiter for the OPENAI_RPM / OPENAI_TPM env vars.
+        
+        Returns:
+            The limiter, or None if neither is set or a value is not a
+            positive number (requests then run unthrottled)
+        """
+        rpm = os.getenv('OPENAI_RPM')
+        tpm = os.getenv('OPENAI_TPM')
+        if not (rpm or tpm):
+            return None
+        try:
+            rate_rpm = float(rpm) if rpm else None
+            rate_tpm = float(tpm) if tpm else None
+        except ValueError:
+            print(f"⚠️  Invalid OPENAI_RPM/OPENAI_TPM ({rpm!r}/{tpm!r}), running without rate limiting")
+            return None
+        if any(rate is not None and not rate > 0 for rate in (rate_rpm, rate_tpm)):
+            print(f"⚠️  OPENAI_RPM/OPENAI_TPM must be positive ({rpm!r}/{tpm!r}), running without rate limiting")
+            return None
+        return cls(rate_rpm, rate_tpm)
+    
+    def _refill(self):
+        """Add the allowance accrued since the last call."""
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+        if self.rate_rpm:
+            self._requests = min(self.rate_rpm, self._requests + elapsed_minutes * self.rate_rpm)
+        if self.rate_tpm:
+            self._tokens = min(self.rate_tpm, self._tokens + elapsed_minutes * self.rate_tpm)
+    
+    async def acquire(self, tokens_estimate: int = TOKENS_PER_REQUEST_ESTIMATE):
+        """
+        Wait until one request of about `tokens_estimate` tokens fits the limits.
+        
+        Args:
+            tokens_estimate: Tokens the request is expected to use
+        """
+        if self.rate_tpm:
+            # A request larger than a minute's allowance waits for a full bucket
+            tokens_estimate = min(tokens_estimate, self.rate_tpm)
+        # Callers queue in order; the one at the head sleeps until it fits
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.rate_rpm and self._requests < 1:
+                    wait = max(wait, (1 - self._requests) / self.rate_rpm * 60)
+                if self.rate_tpm and self._tokens < tokens_estimate:
+                    wait = max(wait, (tokens_estimate - self._tokens) / self.rate_tpm * 60)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            
+            if self.rate_rpm:
+                self._requests -= 1
+            if self.rate_tpm:
+                self._tokens -= tokens_estimate
+
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed request.
+    
+    Args:
+        error: The retryable error
+        attempt: Zero-based number of the failed attempt
+        
+    Returns:
+        The server's Retry-After for rate limits that carry one, otherwise
+        exponential backoff
+    """
+    response = getattr(error, 'response', None)
+    if isinstance(error, RateLimitError) and response is not None:
+        headers = response.headers
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after'):
+                return float(headers['retry-after'])
+        except ValueError:  # An HTTP date; back off as usual
+            pass
+    return 2 ** attempt
+
 
 class NewsSummarizer:
-    def __init__(self, model_name: str = "gpt-4o"):
+    def __init__(self, model_name: Optional[str] = None, cache_file: Optional[str] = LLM_CACHE_FILE,
+                 concurrency: int = MAX_CONCURRENT_REQUESTS,
+                 escalation_model: Optional[str] = ESCALATION_MODEL,
+                 semantic_cache_file: Optional[str] = SEMANTIC_CACHE_FILE,
+                 config_file: str = "config.json"):
         """
         Initialize the summarizer with OpenAI client.
         
         Args:
-            model_name: OpenAI model to use for summarization
+            model_name: OpenAI model to use for summarization (defaults to
+                llm_config.model in config_file, else DEFAULT_MODEL)
+            cache_file: SQLite file caching responses across runs (None disables caching)
+            concurrency: Maximum number of API requests in flight at once
+            escalation_model: Model that re-summarizes an article once when
+                model_name's reply is unusable (None disables escalation)
+            semantic_cache_file: SQLite file of article embeddings whose summaries
+                are reused for near-identical articles (None, or no cache_file,
+                disables it)
+            config_file: Path to configuration file
         """
+        if model_name is None:
+            model_name = self.configured_model(config_file)
         self.model_name = model_name
-        api_key = os.getenv('OPENAI_API_KEY')
+        self.escalation_model = escalation_model if escalation_model != model_name else None
+        self.api_key = os.getenv('OPENAI_API_KEY')
         
-        if not api_key:
+        if not self.api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        self.client = OpenAI(api_key=api_key)
+        self.concurrency = concurrency
+        # Async clients of the current run; their connections belong to that
+        # run's event loop, so each asyncio.run() opens its own
+        self._http: Optional[httpx.AsyncClient] = None
+        self.aclient: Optional[AsyncOpenAI] = None
+        self._bucket: Optional[TokenBucket] = None
         self.total_tokens_used = 0
+        self.tokens_by_model: Dict[str, int] = {}
+        self.cache = LLMCache(cache_file) if cache_file else None
+        self.semantic_cache = (
+            SemanticCache(semantic_cache_file, scope=f"{PROMPT_VERSION}:{model_name}")
+            if cache_file and semantic_cache_file else None
+        )
         print(f"Initialized summarizer with model: {model_name}")
     
+    @staticmethod
+    def configured_model(config_file: str) -> str:
+        """Model named by llm_config.model in the config file, or DEFAULT_MODEL."""
+        try:
+            config = load_config(config_file)
+        except FileNotFoundError:
+            return DEFAULT_MODEL
+        return config.get('llm_config', {}).get('model') or DEFAULT_MODEL
+    
     def create_summary_prompt(self, article: Dict) -> str:
         """
         Create a prompt for summarizing an article.
@@ -43,31 +262,93 @@ class NewsSummarizer:
         Returns:
             Formatted prompt string
         """
-        title = article.get('title', '')
-        description = article.get('description', '')
-        url = article.get('url', '')
-        source = article.get('source', '')
+        return SUMMARY_PROMPT_TEMPLATE.format(
+            title=article.get('title', ''),
+            description=article.get('description', ''),
+            source=article.get('source', ''),
+            url=article.get('url', '')
+        )
+    
+    def create_batch_prompt(self, articles: List[Dict]) -> str:
+        """
+        Create a prompt summarizing several articles in one JSON reply.
         
-        prompt = f"""请为以下科技新闻撰写中文摘要和标签：
-
-标题：{title}
-描述：{description}
-来源：{source}
-链接：{url}
-
-请按照以下格式回复：
-
-摘要：[用2-3句话总结这条新闻的核心内容，使用简洁明了的中文]
-
-标签：[提供3-5个相关的中文标签，用逗号分隔，例如：人工智能,苹果,新产品发布,移动技术]
-
-要求：
-1. 摘要要准确传达新闻的关键信息和影响
-2. 使用通俗易懂的中文表达
-3. 标签应该涵盖技术领域、公司名称、产品类型等关键词
-4. 保持客观中性的语调"""
-
-        return prompt
+        Args:
+            articles: Article dictionaries; their list index is the reply id
+            
+        Returns:
+            Formatted prompt string
+        """
+        items = [
+            {
+                "id": i,
+                "title": article.get('title', ''),
+                "description": article.get('description', ''),
+                "source": article.get('source', '')
+            }
+            for i, article in enumerate(articles)
+        ]
+        
+        # orjson writes non-ASCII as is and without spaces, keeping the prompt short
+        return BATCH_PROMPT_TEMPLATE.format(items=orjson.dumps(items).decode())
+    
+    def chat_params(self, prompt: str, model: Optional[str] = None) -> Dict:
+        """
+        Chat completion parameters for summarizing one article.
+        
+        Args:
+            prompt: Prompt from create_summary_prompt()
+            model: Model to ask (defaults to model_name)
+            
+        Returns:
+            Keyword arguments for chat.completions.create (also the Batch API
+            request body)
+        """
+        return {
+            "model": model or self.model_name,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 300,
+            "temperature": 0.3
+        }
+    
+    def record_tokens(self, model: str, tokens: int):
+        """Add a response's token usage to the totals, per model and overall."""
+        self.total_tokens_used += tokens
+        self.tokens_by_model[model] = self.tokens_by_model.get(model, 0) + tokens
+    
+    @staticmethod
+    def needs_escalation(summary: str, bullets: List[str]) -> bool:
+        """Whether a parsed reply is too poor to keep (failed parse, stub summary or no tags)."""
+        return len(summary) < MIN_SUMMARY_LENGTH or bullets == DEFAULT_BULLETS
+    
+    def _cache_key(self, article: Dict) -> Optional[str]:
+        """Cache key of an article's summary, or None when caching is off."""
+        if not self.cache:
+            return None
+        return LLMCache.make_key(
+            version=PROMPT_VERSION, model=self.model_name, system=SYSTEM_PROMPT,
+            user=self.create_summary_prompt(article)
+        )
+    
+    def _cached_article(self, article: Dict, cache_key: Optional[str]) -> Optional[Dict]:
+        """Article with its cached summary applied, or None on a miss."""
+        if not cache_key:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        print(f"💾 Cached summary: {article.get('title', '')[:50]}...")
+        return self.with_summary(article, cached['summary'], cached['bullets'])
+    
+    @staticmethod
+    def with_summary(article: Dict, summary: str, bullets: List[str]) -> Dict:
+        """Add summary and bullets to the article in place and return it."""
+        article['summary'] = summary
+        article['bullets'] = bullets
+        return article
     
     def summarize_article(self, article: Dict, max_retries: int = 3) -> Dict:
         """
@@ -77,54 +358,319 @@ class NewsSummarizer:
             article: Article dictionary
             max_retries: Maximum number of retry attempts
             
+        Returns:
+            The article dictionary, with summary and bullets fields added in place
+        """
+        return asyncio.run(self._summarize_all([article], max_retries))[0]
+    
+    def summarize_batch(self, articles: List[Dict], batch_size: int = BATCH_SIZE) -> List[Dict]:
+        """
+        Summarize articles `batch_size` per request, batches running concurrently.
+        
+        Args:
+            articles: Article dictionaries
+            batch_size: Articles per request
+            
+        Returns:
+            The article dictionaries, with summary and bullets fields added in
+            place, in input order
+        """
+        return asyncio.run(self._summarize_all(articles, batch_size=batch_size))
+    
+    async def _summarize_all(self, articles: List[Dict], max_retries: int = 3,
+                             batch_size: int = 1) -> List[Dict]:
+        """Summarize articles concurrently (one or a batch per request), keeping their order."""
+        sem = asyncio.Semaphore(self.concurrency)
+        # One pooled (HTTP/2 when available) connection set for every request
+        self._http = httpx.AsyncClient(
+            http2=h2 is not None, limits=HTTP_LIMITS, timeout=httpx.Timeout(30.0)
+        )
+        self.aclient = AsyncOpenAI(api_key=self.api_key, http_client=self._http)
+        # Per-run like the semaphore: the lock inside belongs to this event loop
+        self._bucket = TokenBucket.from_env()
+        try:
+            if not self.semantic_cache:
+                return await self._summarize_uncached(articles, sem, max_retries, batch_size)
+            
+            # Exact cache first, then near-identical stories, then the chat model
+            results: List[Optional[Dict]] = [None] * len(articles)
+            cache_keys = [self._cache_key(article) for article in articles]
+            for i, article in enumerate(articles):
+                results[i] = self._cached_article(article, cache_keys[i])
+            pending = [i for i, result in enumerate(results) if result is None]
+            
+            vectors = await self.aembed([articles[i] for i in pending]) if pending else []
+            for i, vector in zip(pending, vectors):
+                cached = self.semantic_cache.get(vector)
+                if cached is not None:
+                    print(f"🧭 Similar story cached: {articles[i].get('title', '')[:50]}...")
+                    results[i] = self.with_summary(articles[i], cached['summary'], cached['bullets'])
+            
+            misses = [i for i in pending if results[i] is None]
+            summarized = await self._summarize_uncached(
+                [articles[i] for i in misses], sem, max_retries, batch_size,
+                cache_keys=[cache_keys[i] for i in misses]
+            )
+            vector_of = dict(zip(pending, vectors))
+            for i, article in zip(misses, summarized):
+                results[i] = article
+                if i in vector_of and not self.needs_escalation(article['summary'], article['bullets']):
+                    self.semantic_cache.set(
+                        vector_of[i], {"summary": article['summary'], "bullets": article['bullets']}
+                    )
+            return results
+        finally:
+            await self.aclose()
+    
+    async def _summarize_uncached(self, articles: List[Dict], sem: asyncio.Semaphore,
+                                  max_retries: int, batch_size: int,
+                                  cache_keys: Optional[List[Optional[str]]] = None) -> List[Dict]:
+        """Summarize articles one or a batch per request, keeping their order."""
+        keys = cache_keys if cache_keys is not None else [None] * len(articles)
+        if batch_size <= 1:
+            return await asyncio.gather(*[
+                self.asummarize_article(article, sem, max_retries, cache_key=key)
+                for article, key in zip(articles, keys)
+            ])
+        batches = await asyncio.gather(*[
+            self.asummarize_batch(
+                articles[start:start + batch_size], sem, max_retries,
+                cache_keys=None if cache_keys is None else cache_keys[start:start + batch_size]
+            )
+            for start in range(0, len(articles), batch_size)
+        ])
+        return [article for batch in batches for article in batch]
+    
+    async def aembed(self, articles: List[Dict]) -> List[List[float]]:
+        """
+        Embed each article's title and description in one request.
+        
+        Args:
+            articles: Article dictionaries
+            
+        Returns:
+            One embedding per article, or none at all if the request failed
+            (every article then counts as a semantic cache miss)
+        """
+        try:
+            response = await self.aclient.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[f"{article.get('title', '')} {article.get('description', '')}" for article in articles]
+            )
+        except Exception as e:
+            print(f"⚠️  Embedding request failed ({e}), skipping the semantic cache")
+            return []
+        self.record_tokens(EMBEDDING_MODEL, response.usage.total_tokens)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+    
+    async def throttle(self, tokens_estimate: int):
+        """Wait for the configured rate limits (if any) to allow one more request."""
+        if self._bucket is not None:
+            await self._bucket.acquire(tokens_estimate)
+    
+    async def aclose(self):
+        """Close the async API client and its connection pool."""
+        if self.aclient is not None:
+            await self.aclient.close()
+            self.aclient = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    async def asummarize_batch(self, articles: List[Dict], sem: asyncio.Semaphore,
+                               max_retries: int = 3,
+                               cache_keys: Optional[List[Optional[str]]] = None) -> List[Dict]:
+        """
+        Summarize several articles with one JSON-mode request.
+        
+        Cached articles are left out of the request. Articles the reply does
+        not cover, or all of them if it is not valid JSON, are summarized one
+        by one instead.
+        
+        Args:
+            articles: Article dictionaries
+            sem: Semaphore bounding concurrent API requests
+            max_retries: Maximum number of attempts on rate limits and
+                connection errors
+            cache_keys: Keys already looked up (and missed) by the caller; the
+                cache is consulted here only when they are not given
+            
+        Returns:
+            Articles with added summary and bullets fields, in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(articles)
+        if cache_keys is None:
+            cache_keys = [self._cache_key(article) for article in articles]
+            for i, article in enumerate(articles):
+                results[i] = self._cached_article(article, cache_keys[i])
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        prompt = self.create_batch_prompt([articles[i] for i in pending])
+        items = {}
+        for attempt in range(max_retries):
+            try:
+                async with sem:
+                    await self.throttle(TOKENS_PER_REQUEST_ESTIMATE * len(pending))
+                    response = await self.aclient.chat.completions.create(
+                        model=self.model_name,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=300 * len(pending),
+                        temperature=0.3,
+                        timeout=30 + 10 * len(pending),
+                        response_format={"type": "json_object"}
+                    )
+                
+                tokens_used = response.usage.total_tokens
+                self.record_tokens(self.model_name, tokens_used)
+                print(f"✅ Summarized batch of {len(pending)} articles (Tokens: {tokens_used})")
+                
+                try:
+                    payload = orjson.loads(response.choices[0].message.content)
+                    items = {str(item.get('id')): item for item in payload.get('articles', [])
+                             if isinstance(item, dict)}
+                except (ValueError, TypeError, AttributeError) as e:
+                    print(f"⚠️  Batch reply is not the expected JSON ({e}), summarizing one by one")
+                break
+                
+            except RETRYABLE_ERRORS as e:
+                if attempt == max_retries - 1:
+                    print(f"❌ Failed to summarize batch after {max_retries} attempts: {e}")
+                    for i in pending:
+                        results[i] = self.fallback_article(articles[i])
+                    return results
+                # Back off without holding a slot, so other batches proceed
+                wait_time = retry_delay(e, attempt)
+                print(f"⚠️  Batch attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
+                await asyncio.sleep(wait_time)
+                
+            except Exception as e:
+                print(f"❌ Failed to summarize batch: {e}")
+                for i in pending:
+                    results[i] = self.fallback_article(articles[i])
+                return results
+        
+        retry = []
+        for n, i in enumerate(pending):
+            item = items.get(str(n), {})
+            summary = item.get('summary')
+            bullets = item.get('bullets')
+            if not (isinstance(summary, str) and summary.strip() and isinstance(bullets, list) and bullets):
+                retry.append(i)
+                continue
+            summary = summary.strip()
+            bullets = [str(tag).strip() for tag in bullets if str(tag).strip()]
+            if self.needs_escalation(summary, bullets):
+                retry.append(i)
+                continue
+            if cache_keys[i]:
+                self.cache.set(cache_keys[i], {"summary": summary, "bullets": bullets})
+            results[i] = self.with_summary(articles[i], summary, bullets)
+        
+        # Anything missing, malformed or too poor goes through the single-article
+        # path, which escalates to the larger model if needed
+        if retry:
+            singles = await asyncio.gather(*[
+                self.asummarize_article(articles[i], sem, max_retries, cache_key=cache_keys[i])
+                for i in retry
+            ])
+            for i, article in zip(retry, singles):
+                results[i] = article
+        
+        return results
+    
+    async def asummarize_article(self, article: Dict, sem: asyncio.Semaphore,
+                                 max_retries: int = 3, cache_key: Optional[str] = None) -> Dict:
+        """
+        Summarize a single article, holding `sem` while a request is in flight.
+        
+        Args:
+            article: Article dictionary
+            sem: Semaphore bounding concurrent API requests
+            max_retries: Maximum number of attempts on rate limits and
+                connection errors
+            cache_key: Key already looked up (and missed) by the caller; the
+                cache is consulted here only when it is not given
+            
         Returns:
             Article dictionary with added summary and bullets fields
         """
         prompt = self.create_summary_prompt(article)
         
+        # Same model and prompts give the same answer: reuse it without an API call
+        if cache_key is None:
+            cache_key = self._cache_key(article)
+            cached = self._cached_article(article, cache_key)
+            if cached is not None:
+                return cached
+        
+        parsed = await self._arequest_summary(prompt, sem, max_retries, self.model_name)
+        if parsed is None:
+            return self.fallback_article(article)
+        summary, bullets, tokens_used = parsed
+        
+        # Unusable reply from the default model: ask the larger one once
+        if self.escalation_model and self.needs_escalation(summary, bullets):
+            print(f"⬆️  Weak summary from {self.model_name}, retrying with {self.escalation_model}: "
+                  f"{article.get('title', '')[:50]}...")
+            escalated = await self._arequest_summary(prompt, sem, max_retries, self.escalation_model)
+            if escalated is not None:
+                summary, bullets, tokens_used = escalated
+        
+        # A failed parse is not worth replaying for a week: leave it to the next run
+        if cache_key and not self.needs_escalation(summary, bullets):
+            self.cache.set(cache_key, {"summary": summary, "bullets": bullets, "tokens": tokens_used})
+        
+        print(f"✅ Summarized: {article.get('title', '')[:50]}... (Tokens: {tokens_used})")
+        return self.with_summary(article, summary, bullets)
+    
+    async def _arequest_summary(self, prompt: str, sem: asyncio.Semaphore, max_retries: int,
+                                model: str) -> Optional[Tuple[str, List[str], int]]:
+        """
+        Request and parse one single-article summary.
+        
+        Returns:
+            (summary, bullets, tokens used), or None if the request failed
+        """
         for attempt in range(max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {
-                            "role": "system", 
-                            "content": "你是一个专业的科技新闻编辑，擅长将英文科技新闻总结成简洁明了的中文摘要。"
-                        },
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=300,
-                    temperature=0.3,
-                    timeout=30
-                )
+                async with sem:
+                    await self.throttle(TOKENS_PER_REQUEST_ESTIMATE)
+                    response = await self.aclient.chat.completions.create(
+                        **self.chat_params(prompt, model), timeout=30
+                    )
                 
                 content = response.choices[0].message.content.strip()
                 tokens_used = response.usage.total_tokens
-                self.total_tokens_used += tokens_used
+                self.record_tokens(model, tokens_used)
                 
                 # Parse the response to extract summary and bullets
                 summary, bullets = self.parse_llm_response(content)
+                return summary, bullets, tokens_used
                 
-                # Add summary and bullets to article
-                enhanced_article = article.copy()
-                enhanced_article['summary'] = summary
-                enhanced_article['bullets'] = bullets
-                
-                print(f"✅ Summarized: {article.get('title', '')[:50]}... (Tokens: {tokens_used})")
-                return enhanced_article
-                
-            except Exception as e:
+            except RETRYABLE_ERRORS as e:
                 if attempt == max_retries - 1:
                     print(f"❌ Failed to summarize after {max_retries} attempts: {e}")
-                    # Return article with fallback summary
-                    fallback_article = article.copy()
-                    fallback_article['summary'] = f"无法生成摘要：{article.get('description', '')[:100]}..."
-                    fallback_article['bullets'] = ["科技", "新闻"]
-                    return fallback_article
-                else:
-                    wait_time = 2 ** attempt
-                    print(f"⚠️  Attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+                    return None
+                # Back off without holding a slot, so other articles proceed
+                wait_time = retry_delay(e, attempt)
+                print(f"⚠️  Attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
+                await asyncio.sleep(wait_time)
+                
+            except Exception as e:
+                print(f"❌ Failed to summarize: {e}")
+                return None
+    
+    @staticmethod
+    def fallback_article(article: Dict) -> Dict:
+        """Add a placeholder summary and tags to the article in place and return it."""
+        article['summary'] = f"无法生成摘要：{article.get('description', '')[:100]}..."
+        article['bullets'] = list(DEFAULT_BULLETS)
+        return article
     
     def parse_llm_response(self, content: str) -> tuple[str, List[str]]:
         """
@@ -136,6 +682,13 @@ class NewsSummarizer:
         Returns:
             Tuple of (summary, bullets_list)
         """
+        # Well-formed replies are parsed in one match; anything else goes
+        # through the line-by-line fallback below
+        match = _RESPONSE_RE.fullmatch(content)
+        if match:
+            bullets = [tag for tag in _TAG_SEPARATOR_RE.split(match.group('tags')) if tag]
+            return match.group('summary'), bullets or list(DEFAULT_BULLETS)
+        
         lines = content.strip().split('\n')
         summary = ""
         bullets = []
@@ -178,72 +731,186 @@ class NewsSummarizer:
                 summary = "摘要解析失败"
         
         if not bullets:
-            bullets = ["科技", "新闻"]
+            bullets = list(DEFAULT_BULLETS)
         
         return summary, bullets
     
-    def summarize_articles(self, input_file: str, output_file: str) -> List[Dict]:
+    def summarize_with_batch_api(self, articles: List[Dict]) -> List[Dict]:
         """
-        Summarize all articles from input file and save to output file.
+        Summarize articles through the OpenAI Batch API, waiting for the result.
+        
+        Cached articles are not submitted. Each remaining article becomes one
+        request line of an uploaded JSONL file; the job is polled every
+        BATCH_API_POLL_SECONDS until it finishes (up to 24h). Articles without
+        a successful response get the fallback summary.
         
         Args:
-            input_file: Path to input JSON file with selected articles
-            output_file: Path to output JSON file for summarized articles
+            articles: Article dictionaries
+            
+        Returns:
+            Articles with added summary and bullets fields, in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(articles)
+        cache_keys = [self._cache_key(article) for article in articles]
+        for i, article in enumerate(articles):
+            results[i] = self._cached_article(article, cache_keys[i])
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        if pending:
+            client = OpenAI(api_key=self.api_key)
+            
+            # custom_id is the article's index in `articles`
+            fd, request_file = tempfile.mkstemp(suffix=".jsonl", prefix="summary_batch_")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for i in pending:
+                        request = {
+                            "custom_id": str(i),
+                            "method": "POST",
+                            "url": "/v1/chat/completions",
+                            "body": self.chat_params(self.create_summary_prompt(articles[i]))
+                        }
+                        f.write(orjson.dumps(request) + b"\n")
+                with open(request_file, 'rb') as f:
+                    uploaded = client.files.create(file=f, purpose="batch")
+            finally:
+                os.remove(request_file)
+            
+            batch = client.batches.create(
+                input_file_id=uploaded.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            print(f"📤 Submitted batch {batch.id} with {len(pending)} requests")
+            
+            while batch.status not in BATCH_API_DONE_STATUSES:
+                time.sleep(BATCH_API_POLL_SECONDS)
+                batch = client.batches.retrieve(batch.id)
+                counts = batch.request_counts
+                progress = f" ({counts.completed}/{counts.total})" if counts else ""
+                print(f"⏳ Batch {batch.id}: {batch.status}{progress}")
+            
+            if batch.status == "completed" and batch.output_file_id:
+                output = client.files.content(batch.output_file_id).text
+                for line in output.splitlines():
+                    if not line.strip():
+                        continue
+                    record = orjson.loads(line)
+                    response = record.get("response") or {}
+                    if response.get("status_code") != 200:
+                        continue
+                    
+                    i = int(record["custom_id"])
+                    body = response["body"]
+                    tokens_used = body["usage"]["total_tokens"]
+                    self.record_tokens(self.model_name, tokens_used)
+                    
+                    summary, bullets = self.parse_llm_response(body["choices"][0]["message"]["content"].strip())
+                    if cache_keys[i] and not self.needs_escalation(summary, bullets):
+                        self.cache.set(cache_keys[i], {"summary": summary, "bullets": bullets, "tokens": tokens_used})
+                    results[i] = self.with_summary(articles[i], summary, bullets)
+            else:
+                print(f"❌ Batch {batch.id} ended with status: {batch.status}")
+        
+        failed = [i for i, result in enumerate(results) if result is None]
+        if failed:
+            print(f"⚠️  {len(failed)} articles got no batch response, using fallback summaries")
+            for i in failed:
+                results[i] = self.fallback_article(articles[i])
+        
+        return results
+    
+    def summarize_articles_batch(self, input_file: Union[str, List[Dict]],
+                                 output_file: Optional[str] = None) -> List[Dict]:
+        """
+        Like summarize_articles(), but through the discounted Batch API.
+        
+        Args:
+            input_file: Path to input article file, or the articles themselves
+            output_file: Path to output NDJSON file (None skips writing)
             
         Returns:
             List of summarized articles
         """
-        # Load articles from input file
-        if not os.path.exists(input_file):
-            raise FileNotFoundError(f"Input file not found: {input_file}")
+        return self.summarize_articles(input_file, output_file, use_batch_api=True)
+    
+    def summarize_articles(self, input_file: Union[str, List[Dict]],
+                           output_file: Optional[str] = None,
+                           use_batch_api: bool = False) -> List[Dict]:
+        """
+        Summarize all articles from input file and save to output file.
         
-        with open(input_file, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
+        Args:
+            input_file: Path to input article file (NDJSON or JSON array), or the
+                articles themselves when called in-process (their dictionaries
+                get the summary fields added in place)
+            output_file: Path to output NDJSON file for summarized articles
+                (None skips writing)
+            use_batch_api: Submit through the Batch API (half price, may take
+                hours) instead of synchronous requests
+            
+        Returns:
+            List of summarized articles
+        """
+        if isinstance(input_file, str):
+            # Load articles from input file
+            if not os.path.exists(input_file):
+                raise FileNotFoundError(f"Input file not found: {input_file}")
+            
+            # Batching slices the list, so it is materialized once here
+            articles = list(load_articles(input_file))
+        else:
+            articles = input_file
         
         if not articles:
-            print("No articles found in input file.")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+            print("No articles found in input.")
+            if output_file:
+                dump_articles(output_file, [])
             return []
         
         print(f"Summarizing {len(articles)} articles...")
         
-        summarized_articles = []
-        for i, article in enumerate(articles, 1):
-            print(f"Processing article {i}/{len(articles)}...")
-            summarized_article = self.summarize_article(article)
-            summarized_articles.append(summarized_article)
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
+        if use_batch_api:
+            summarized_articles = self.summarize_with_batch_api(articles)
+        else:
+            # BATCH_SIZE articles per request, up to `concurrency` requests in flight
+            summarized_articles = self.summarize_batch(articles)
         
         # Save summarized articles
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(summarized_articles, f, ensure_ascii=False, indent=2)
+        if output_file:
+            dump_articles(output_file, summarized_articles)
         
         print(f"\nSummarization completed:")
         print(f"  Articles processed: {len(summarized_articles)}")
         print(f"  Total tokens used: {self.total_tokens_used}")
-        print(f"  Results saved to: {output_file}")
+        if len(self.tokens_by_model) > 1:
+            for model, tokens in self.tokens_by_model.items():
+                print(f"    {model}: {tokens}")
+        if self.cache:
+            print(f"  Cache hits: {self.cache.hits}/{self.cache.hits + self.cache.misses}")
+        if self.semantic_cache:
+            semantic_lookups = self.semantic_cache.hits + self.semantic_cache.misses
+            print(f"  Similar-story cache hits: {self.semantic_cache.hits}/{semantic_lookups}")
+        if output_file:
+            print(f"  Results saved to: {output_file}")
         
         return summarized_articles
 
 
 def main():
     """Command line interface."""
-    if len(sys.argv) != 2:
-        print("Usage: python -m news_bot.summarizer YYYY-MM-DD")
+    args = sys.argv[1:]
+    flags = {arg for arg in args if arg.startswith("--")}
+    args = [arg for arg in args if not arg.startswith("--")]
+    if len(args) != 1 or flags - {"--no-cache", "--batch"}:
+        print("Usage: python -m news_bot.summarizer YYYY-MM-DD [--no-cache] [--batch]")
         sys.exit(1)
+    no_cache = "--no-cache" in flags
     
-    date = sys.argv[1]
+    date = args[0]
     
     # Validate date format
-    try:
-        import datetime
-        datetime.datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        print("Error: Date must be in YYYY-MM-DD format")
-        sys.exit(1)
+    parse_date_or_exit(date)
     
     # Try select file first, fall back to dedup file if selector not implemented
     input_file = f"select_{date}.json"
@@ -253,8 +920,10 @@ def main():
     output_file = f"summary_{date}.json"
     
     try:
-        summarizer = NewsSummarizer()
-        summarized_articles = summarizer.summarize_articles(input_file, output_file)
+        summarizer = NewsSummarizer(cache_file=None if no_cache else LLM_CACHE_FILE)
+        summarized_articles = summarizer.summarize_articles(
+            input_file, output_file, use_batch_api="--batch" in flags
+        )
         
         if len(summarized_articles) > 0:
             avg_tokens = summarizer.total_tokens_used / len(summarized_articles)
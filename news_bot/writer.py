@@ -3,14 +3,38 @@ Markdown generation with YAML front-matter for Astro blog.
 Converts summarized news articles into properly formatted blog posts.
 """
 
-import json
 import sys
+import heapq
+import io
+import json
 import os
-from datetime import datetime
-from typing import List, Dict
+import re
+from collections import Counter
+from typing import List, Dict, Mapping, Union
 from pathlib import Path
-import yaml
 
+from ._articles import load_articles
+from ._cli import parse_date_or_exit
+from ._config import load_config
+
+# Fixed front-matter shape, keys in the order yaml.dump used to emit them.
+# Scalars are JSON strings, which are valid YAML double-quoted scalars.
+FRONTMATTER_TEMPLATE = """description: {description}
+layout: news
+pubDate: {date}
+tags:
+{tags}title: {title}
+"""
+
+# One digest entry per write; the tags line is filled in only when there are tags
+ARTICLE_TEMPLATE = """- **{title}**
+  {summary}
+{tags}  [阅读原文]({url}) | 来源：{source}
+
+"""
+TAGS_TEMPLATE = "  *标签：{tags}*\n"
+# Article tags listed in the front matter, after "News" and "Daily"
+MAX_FRONTMATTER_TAGS = 10
 
 class NewsWriter:
     def __init__(self, config_file: str = "config.json"):
@@ -28,12 +52,30 @@ class NewsWriter:
             "科学研究": ["研究", "科学", "发现", "突破", "实验", "nature", "science"],
             "其他科技": []  # 默认分类
         }
+        
+        # One alternation over every keyword, so an article is scanned once
+        # instead of once per keyword; matches map back to their category.
+        # The lookahead tries every position, so overlapping keywords are all
+        # seen; at each position it takes the longest keyword starting there
+        self._keyword_categories = {
+            keyword.lower(): category
+            for category, keywords in self.topic_keywords.items()
+            for keyword in keywords
+        }
+        self._keyword_pattern = re.compile('(?=(' + '|'.join(
+            re.escape(keyword) for keyword in sorted(self._keyword_categories, key=len, reverse=True)
+        ) + '))')
+        # Keywords occurring inside a longer one ("ai" in "openai", "自动驾驶" in
+        # "自动驾驶汽车") are present whenever the longer one matches
+        self._keyword_substrings = {
+            keyword: [other for other in self._keyword_categories if other != keyword and other in keyword]
+            for keyword in self._keyword_categories
+        }
     
-    def load_config(self, config_file: str) -> Dict:
+    def load_config(self, config_file: str) -> Mapping:
         """Load configuration from JSON file."""
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_config(config_file)
         except FileNotFoundError:
             print(f"Warning: Config file {config_file} not found, using defaults")
             return {
@@ -49,26 +91,35 @@ class NewsWriter:
         """
         Categorize an article based on its content.
         
+        A tag that is itself a category keyword decides the category outright;
+        otherwise keywords in the title, summary and tags are scored.
+        
         Args:
             article: Article dictionary with title, summary, bullets
             
         Returns:
             Category name in Chinese
         """
-        title = article.get('title', '').lower()
-        summary = article.get('summary', '').lower()
-        bullets = [tag.lower() for tag in article.get('bullets', [])]
+        title = article.get('title', '')
+        summary = article.get('summary', '')
+        bullets = article.get('bullets', [])
         
-        content = f"{title} {summary} {' '.join(bullets)}"
+        # Tags are short and high-signal: an exact keyword match is taken as is
+        for tag in bullets:
+            category = self._keyword_categories.get(tag.strip().lower())
+            if category:
+                return category
         
-        # Find the best matching category
-        category_scores = {}
-        for category, keywords in self.topic_keywords.items():
-            if category == "其他科技":
-                continue
-            score = sum(1 for keyword in keywords if keyword.lower() in content)
-            if score > 0:
-                category_scores[category] = score
+        # Keywords were lowercased once when the pattern was built
+        content = f"{title} {summary} {' '.join(bullets)}".lower()
+        
+        # Score each category by how many of its keywords occur; scores are
+        # listed in category order so ties go to the earlier category
+        found = set(self._keyword_pattern.findall(content))
+        for keyword in list(found):
+            found.update(self._keyword_substrings[keyword])
+        counts = Counter(self._keyword_categories[keyword] for keyword in found)
+        category_scores = {category: counts[category] for category in self.topic_keywords if counts[category]}
         
         if category_scores:
             return max(category_scores, key=category_scores.get)
@@ -109,22 +160,21 @@ class NewsWriter:
         first_summary = articles[0].get('summary', '') if articles else "今日科技新闻速览"
         
         # Collect all unique tags
-        all_tags = set()
-        for article in articles:
-            all_tags.update(article.get('bullets', []))
+        all_tags = {tag for article in articles for tag in article.get('bullets', [])}
         
-        # Limit to most relevant tags
-        sorted_tags = sorted(list(all_tags))[:10]
+        # Limit to most relevant tags (partial sort, only the first few are kept)
+        sorted_tags = heapq.nsmallest(MAX_FRONTMATTER_TAGS, all_tags)
         
-        frontmatter = {
-            'title': f"每日新闻速览 · {date}",
-            'pubDate': date,
-            'description': first_summary[:100] + ("..." if len(first_summary) > 100 else ""),
-            'tags': ["News", "Daily"] + sorted_tags,
-            'layout': "news"
-        }
+        description = first_summary[:100] + ("..." if len(first_summary) > 100 else "")
+        tags = ["News", "Daily"] + sorted_tags
         
-        return yaml.dump(frontmatter, allow_unicode=True, default_flow_style=False)
+        # json.dumps does the quoting and escaping; pubDate stays a string
+        return FRONTMATTER_TEMPLATE.format(
+            description=json.dumps(description, ensure_ascii=False),
+            date=json.dumps(date),
+            tags="".join(f"- {json.dumps(tag, ensure_ascii=False)}\n" for tag in tags),
+            title=json.dumps(f"每日新闻速览 · {date}", ensure_ascii=False)
+        )
     
     def generate_markdown_content(self, grouped_articles: Dict[str, List[Dict]]) -> str:
         """
@@ -136,34 +186,29 @@ class NewsWriter:
         Returns:
             Markdown content string
         """
-        content_lines = []
+        buf = io.StringIO()
         
         for category, articles in grouped_articles.items():
             if not articles:
                 continue
                 
             # Add category header
-            content_lines.append(f"## {category}")
-            content_lines.append("")
+            buf.write(f"## {category}\n\n")
             
             # Add articles in this category
             for article in articles:
-                title = article.get('title', '')
-                summary = article.get('summary', '')
-                url = article.get('url', '')
                 bullets = article.get('bullets', [])
-                source = article.get('source', '')
-                
-                # Format article entry
-                content_lines.append(f"- **{title}**")
-                content_lines.append(f"  {summary}")
-                if bullets:
-                    tags_str = " · ".join(bullets[:5])  # Limit to 5 tags
-                    content_lines.append(f"  *标签：{tags_str}*")
-                content_lines.append(f"  [阅读原文]({url}) | 来源：{source}")
-                content_lines.append("")
-        
-        return "\n".join(content_lines)
+                buf.write(ARTICLE_TEMPLATE.format(
+                    title=article.get('title', ''),
+                    summary=article.get('summary', ''),
+                    # Limit to 5 tags
+                    tags=TAGS_TEMPLATE.format(tags=" · ".join(bullets[:5])) if bullets else "",
+                    url=article.get('url', ''),
+                    source=article.get('source', '')
+                ))
+        
+        # Entries are blank-line separated; the digest ends after the last entry's newline
+        return buf.getvalue()[:-1]
     
     def get_output_filepath(self, date: str) -> Path:
         """
@@ -193,26 +238,30 @@ class NewsWriter:
         print(f"Output file path: {output_file}")
         return output_file
     
-    def write_markdown_file(self, input_file: str, date: str) -> str:
+    def write_markdown_file(self, input_file: Union[str, List[Dict]], date: str) -> str:
         """
         Generate markdown file from summarized articles.
         
         Args:
-            input_file: Path to summary JSON file
+            input_file: Path to summary file (NDJSON or JSON array), or the summarized articles
+                themselves when called in-process
             date: Date string in YYYY-MM-DD format
             
         Returns:
             Path to generated markdown file
         """
-        # Load articles from input file
-        if not os.path.exists(input_file):
-            raise FileNotFoundError(f"Input file not found: {input_file}")
-        
-        with open(input_file, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
+        if isinstance(input_file, str):
+            # Load articles from input file
+            if not os.path.exists(input_file):
+                raise FileNotFoundError(f"Input file not found: {input_file}")
+            
+            # Grouping needs every article, so the file is read into one list
+            articles = list(load_articles(input_file))
+        else:
+            articles = input_file
         
         if not articles:
-            raise ValueError("No articles found in input file")
+            raise ValueError("No articles found in input")
         
         print(f"Processing {len(articles)} articles for markdown generation...")
         
@@ -233,10 +282,7 @@ class NewsWriter:
         
         # Write the complete markdown file
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("---\n")
-            f.write(frontmatter)
-            f.write("---\n\n")
-            f.write(content)
+            f.writelines(("---\n", frontmatter, "---\n\n", content))
         
         print(f"Markdown file generated successfully:")
         print(f"  Output file: {output_file}")
@@ -255,11 +301,7 @@ def main():
     date = sys.argv[1]
     
     # Validate date format
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        print("Error: Date must be in YYYY-MM-DD format")
-        sys.exit(1)
+    parse_date_or_exit(date)
     
     input_file = f"summary_{date}.json"
     